@@ -22,17 +22,95 @@ class Config:
     CONFIDENCE_THRESHOLD = 0.65
     RETRAIN_INTERVAL = 100
     WARMUP_PERIOD = 50
+    ENSEMBLE_DECAY = 0.95  # Smoothing of each ensemble member's recent accuracy
+    ENSEMBLE_NB_VAR_FLOOR = 0.01  # Minimum per-class variance (scaled units) in the naive Bayes member
+    CALIBRATION_WINDOW = 500  # Recent labeled trades the probability calibration is refit on
+    CALIBRATION_MIN_SAMPLES = 100
+    CALIBRATION_REFIT_EVERY = 50  # Labeled trades between calibration refits
+    
+    # Concept drift detection (Page-Hinkley on the per-trade loss rate)
+    DRIFT_DELTA = 0.05
+    DRIFT_THRESHOLD = 10.0
+    DRIFT_MIN_INSTANCES = 30
+    DRIFT_RETRAIN_WINDOW = 100
+    
+    # Offline training pipeline (python -m src.training_pipeline)
+    RECORD_TRAINING_DATA = True
+    TRAINING_DATA_PATH = 'data/training_data.csv'
+    TRAINING_DATA_BATCH_SIZE = 50  # Samples buffered before they are appended in one write
+    TRAINING_CV_SPLITS = 5
+    TRAINING_N_JOBS = -1  # Worker processes for cross-validation (-1: all cores)
+    TRAINING_CACHE_DIR = 'data/cache/folds'
     
     # Risk management
     MAX_DAILY_LOSS = 0.5
     MAX_DRAWDOWN = 1.0
     STOP_LOSS_STREAK = 5
+    MAX_OPEN_POSITIONS = 5  # Concurrent unsettled trades across all assets
+    MAX_OPEN_POSITIONS_PER_ASSET = 1
+    
+    # Trade journal (crash recovery of risk state)
+    JOURNAL_ENABLED = True
+    JOURNAL_PATH = 'data/trade_journal.db'
+    JOURNAL_BATCH_SIZE = 50
+    JOURNAL_FLUSH_INTERVAL = 1.0  # Max seconds before queued trades are committed
+    JOURNAL_SNAPSHOT_EVERY = 1000
     
     # Data collection
     TICK_HISTORY = 1000
+    MAX_TRADES_IN_MEMORY = 10000  # Older trades are only kept on disk
+    TRADE_SPILL_PATH = 'data/trades_spill.csv'  # Where evicted trades go when the journal is off
+    TRADE_SPILL_BATCH_SIZE = 100  # Evicted trades buffered before they are appended in one write
+    
+    # Shared-memory feature bus (run `python -m src.feature_bus` as the producer)
+    FEATURE_BUS_ENABLED = False
+    FEATURE_BUS_NAME = 'otc_feature_bus'
+    FEATURE_BUS_CAPACITY = 1000  # Ticks kept per asset
     
     # Trading schedule
     TRADING_HOURS = {
         "start": time(8, 0),   # 8:00 AM
         "end": time(20, 0)     # 8:00 PM
     }
+    
+    # Per-asset overrides of TRADING_HOURS, e.g.
+    # {"BTCUSD": {"start": time(0, 0), "end": time(23, 59), "weekdays": range(7)}}
+    ASSET_SESSIONS = {}
+    
+    # Dates (datetime.date) on which no asset is traded
+    HOLIDAYS = []
+    
+    # Scheduling (seconds unless noted)
+    TICK_INTERVAL = 1
+    CHECKPOINT_SECONDS = 300
+    ERROR_RETRY_DELAY = 5
+    DAILY_REPORT_TIME = time(23, 55)
+    
+    # Logging
+    LOG_FILE = 'logs/trading_bot.log'
+    LOG_LEVEL = 'INFO'
+    LOG_MAX_BYTES = 10 * 1024 * 1024
+    LOG_BACKUP_COUNT = 5
+    LOG_ROTATE_WHEN = None  # e.g. 'midnight' for time-based instead of size-based rotation
+    LOG_SAMPLE_RATES = {  # Log 1 in N records of these high-frequency events
+        'order': 10,
+        'trade_recorded': 10,  # The per-trade summary ('trade') is always logged
+        'asset_switch': 10
+    }
+    
+    # Performance analytics
+    ANALYTICS_WINDOW = 100  # Trades in the rolling win rate / Sharpe window
+    CONFIDENCE_BUCKET_WIDTH = 0.05
+    STATS_ENABLED = True
+    STATS_HOST = '127.0.0.1'
+    STATS_PORT = int(os.getenv('STATS_PORT', '8765'))  # 0 binds a free port; the log shows which
+    
+    # Latency tracing
+    TRACE_SAMPLE_SIZE = 10000  # Latency samples kept per stage
+    
+    # Memory telemetry
+    MEMORY_SAMPLE_SECONDS = 300
+    MEMORY_HISTORY = 288  # Samples kept (one day at the default interval)
+    MEMORY_TRACEMALLOC = False  # Track top allocators (adds allocation overhead)
+    MEMORY_TOP_ALLOCATORS = 10
+    SOAK_MAX_GROWTH_MB = 20  # Allowed RSS growth after warmup in the soak test
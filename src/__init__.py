@@ -4,6 +4,7 @@ from .trading_model import TradingModel
 from .risk_manager import RiskManager
 from .api_client import PocketOptionClient
 from .telegram_bot import TelegramBot
+from .market_clock import MarketClock
 from .main import OTCTradingBot
 
 __all__ = [
@@ -12,5 +13,6 @@ __all__ = [
     'RiskManager', 
     'PocketOptionClient',
     'TelegramBot',
+    'MarketClock',
     'OTCTradingBot'
 ]
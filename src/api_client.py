@@ -13,6 +13,7 @@ class PocketOptionClient:
         self.demo_mode = demo_mode
         self.base_url = Config.API_DEMO_URL if demo_mode else Config.API_REAL_URL
         self.connected = False
+        self.order_delay = 0.5  # Simulated order processing time (seconds)
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
@@ -81,20 +82,22 @@ class PocketOptionClient:
             'asset': asset,
             'price': new_price,
             'timestamp': datetime.now(),
+            'received_ns': time.monotonic_ns(),  # Ingest time for latency tracing
             'volume': np.random.randint(100, 1000)  # Simulated volume
         }
         
-    def place_trade(self, asset, amount, direction, expiry):
+    def place_trade(self, asset, amount, direction, expiry, trace_id=None):
         """Place a trade (simulated)"""
         if not self.connected:
             logger.warning("Not connected to API. Cannot place trade.")
             return {'success': False, 'error': 'Not connected'}
             
         # In real implementation, this would call the Pocket Option API
-        logger.info(f"Placing trade: {asset}, {direction}, ${amount}, {expiry}s expiry")
+        logger.info("Placing trade: %s, %s, $%s, %ss expiry (trace %s)", asset, direction, amount, expiry,
+                    trace_id, extra={'event': 'order'})
         
         # Simulate trade processing time
-        time.sleep(0.5)
+        time.sleep(self.order_delay)
         
         # Simulate trade outcome 
         # In demo mode, use a higher win rate for testing
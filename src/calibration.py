@@ -0,0 +1,41 @@
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+import logging
+
+logger = logging.getLogger(__name__)
+
+class PlattCalibrator:
+    """Platt scaling: a logistic fit from a model's raw logit to observed outcomes
+
+    Unfitted, it is the identity (apart from clipping raw probabilities
+    away from 0 and 1), so it can be applied unconditionally.
+    """
+    EPSILON = 1e-6
+
+    def __init__(self, slope=1.0, intercept=0.0):
+        self.slope = slope
+        self.intercept = intercept
+        self.fitted = False
+        self.samples = 0
+
+    @classmethod
+    def _logit(cls, probabilities):
+        p = np.clip(np.asarray(probabilities, dtype=float), cls.EPSILON, 1 - cls.EPSILON)
+        return np.log(p / (1 - p))
+
+    def fit(self, probabilities, labels):
+        """Fit on raw probabilities and their 0/1 labels; returns False if both classes are not present"""
+        labels = np.asarray(labels, dtype=int)
+        if len(np.unique(labels)) < 2:
+            return False
+        logits = self._logit(probabilities).reshape(-1, 1)
+        regression = LogisticRegression().fit(logits, labels)
+        self.slope = float(regression.coef_[0, 0])
+        self.intercept = float(regression.intercept_[0])
+        self.fitted = True
+        self.samples = len(labels)
+        return True
+
+    def transform(self, probabilities):
+        z = self.slope * self._logit(probabilities) + self.intercept
+        return 1 / (1 + np.exp(-z))
@@ -1,100 +1,123 @@
+import os
 import pandas as pd
 import numpy as np
+from collections import deque
 from datetime import datetime
 from sklearn.preprocessing import StandardScaler
 import logging
 from config.settings import Config
+from src.market_clock import MarketClock
 
 logger = logging.getLogger(__name__)
 
+# Column order of the feature vectors produced by generate_features
+FEATURE_COLUMNS = [
+    'velocity', 'acceleration', 'micro_rsi', 'volume_ratio', 'price_position',
+    'hour_of_day', 'minute_of_hour', 'day_of_week'
+]
+# Calendar columns; constant over a session, so models that fit per-class variances skip them
+CALENDAR_COLUMNS = ['hour_of_day', 'minute_of_hour', 'day_of_week']
+
+FEATURE_WINDOW = 20  # Ticks used to compute one feature vector
+
 class DataManager:
-    def __init__(self):
-        self.ticks = pd.DataFrame(columns=['timestamp', 'price', 'volume', 'asset'])
-        self.features = pd.DataFrame()
-        self.labels = pd.Series(dtype=float)
+    def __init__(self, clock=None):
+        self.clock = clock or MarketClock()
+        # Fixed-size buffers so memory stays flat however long the bot runs
+        self.ticks = {}  # asset -> deque of (timestamp, price, volume)
+        self.pending_samples = []  # Labeled samples not yet written to TRAINING_DATA_PATH
         self.scaler = StandardScaler()
         
     def add_tick(self, tick_data):
         """Add new tick data to our history"""
-        new_tick = pd.DataFrame([{
-            'timestamp': datetime.now(),
-            'price': tick_data['price'],
-            'volume': tick_data.get('volume', 0),
-            'asset': tick_data.get('asset', 'UNKNOWN')
-        }])
+        timestamp = tick_data.get('timestamp') or datetime.now()
+        self.clock.update(timestamp)
         
-        self.ticks = pd.concat([self.ticks, new_tick], ignore_index=True)
-        
-        # Keep only the most recent ticks
-        if len(self.ticks) > Config.TICK_HISTORY:
-            self.ticks = self.ticks.iloc[-Config.TICK_HISTORY:]
+        asset = tick_data.get('asset', 'UNKNOWN')
+        asset_ticks = self.ticks.get(asset)
+        if asset_ticks is None:
+            asset_ticks = self.ticks[asset] = deque(maxlen=Config.TICK_HISTORY)
+        asset_ticks.append((timestamp, tick_data['price'], tick_data.get('volume', 0)))
             
-        return self.generate_features(tick_data['asset'])
+        return self.generate_features(asset)
     
     def generate_features(self, asset):
         """Generate features from tick data for a specific asset"""
-        # Filter ticks for the specific asset
-        asset_ticks = self.ticks[self.ticks['asset'] == asset]
+        asset_ticks = self.ticks.get(asset, ())
         
-        if len(asset_ticks) < 20:  # Need minimum data for features
+        if len(asset_ticks) < FEATURE_WINDOW:  # Need minimum data for features
             return None
             
-        # Calculate simple features
-        recent = asset_ticks.iloc[-20:]  # Last 20 ticks
+        # Calculate simple features over the last 20 ticks
+        recent = [asset_ticks[i] for i in range(-FEATURE_WINDOW, 0)]
+        prices = np.array([tick[1] for tick in recent], dtype=float)
+        volumes = np.array([tick[2] for tick in recent], dtype=float)
         
         # Price velocity and acceleration
-        price_changes = recent['price'].diff().dropna()
-        velocity = price_changes.mean() if len(price_changes) > 0 else 0
-        acceleration = price_changes.diff().mean() if len(price_changes) > 1 else 0
+        price_changes = np.diff(prices)
+        velocity = price_changes.mean()
+        acceleration = np.diff(price_changes).mean()
         
         # Micro technical indicators
-        current_price = recent['price'].iloc[-1]
-        min_20 = recent['price'].min()
-        max_20 = recent['price'].max()
+        current_price = prices[-1]
+        min_20 = prices.min()
+        max_20 = prices.max()
         
         # Micro RSI (simplified)
-        gains = price_changes[price_changes > 0].sum() if len(price_changes) > 0 else 0
-        losses = -price_changes[price_changes < 0].sum() if len(price_changes) > 0 else 0
+        gains = price_changes[price_changes > 0].sum()
+        losses = -price_changes[price_changes < 0].sum()
         micro_rsi = gains / (gains + losses) if (gains + losses) > 0 else 0.5
         
         # Volume spike detection
-        avg_volume = recent['volume'].mean()
-        current_volume = recent['volume'].iloc[-1]
+        avg_volume = volumes.mean()
+        current_volume = volumes[-1]
         volume_ratio = current_volume / avg_volume if avg_volume > 0 else 1
         
-        # Create feature vector
-        features = pd.DataFrame([{
-            'velocity': velocity,
-            'acceleration': acceleration,
-            'micro_rsi': micro_rsi,
-            'volume_ratio': volume_ratio,
-            'price_position': (current_price - min_20) / (max_20 - min_20) if max_20 != min_20 else 0.5,
-            'hour_of_day': datetime.now().hour,
-            'minute_of_hour': datetime.now().minute,
-            'day_of_week': datetime.now().weekday()
-        }])
-        
-        # Store features for training
-        self.features = pd.concat([self.features, features], ignore_index=True)
-        if len(self.features) > Config.TICK_HISTORY:
-            self.features = self.features.iloc[-Config.TICK_HISTORY:]
+        if self.clock.now is None:
+            self.clock.update()
             
-        return features
+        time_features = self.clock.time_features
+        row = [
+            velocity,
+            acceleration,
+            micro_rsi,
+            volume_ratio,
+            (current_price - min_20) / (max_20 - min_20) if max_20 != min_20 else 0.5,
+            time_features['hour_of_day'],
+            time_features['minute_of_hour'],
+            time_features['day_of_week']
+        ]
+        
+        return pd.DataFrame([row], columns=FEATURE_COLUMNS)
     
-    def add_label(self, outcome):
-        """Add training label (1 for success, 0 for failure)"""
-        self.labels = pd.concat([self.labels, pd.Series([outcome])], ignore_index=True)
-        if len(self.labels) > Config.TICK_HISTORY:
-            self.labels = self.labels.iloc[-Config.TICK_HISTORY:]
+    def record_sample(self, features, label):
+        """Queue a labeled feature vector for the history used for offline training
+        
+        Samples are buffered and appended in batches of TRAINING_DATA_BATCH_SIZE,
+        so the trade path does not write to disk on every trade.
+        """
+        sample = features[FEATURE_COLUMNS].copy()
+        sample.insert(0, 'timestamp', self.clock.now)
+        sample['label'] = label
+        self.pending_samples.append(sample)
+        if len(self.pending_samples) >= Config.TRAINING_DATA_BATCH_SIZE:
+            self.flush_samples()
             
-    def get_training_data(self):
-        """Get features and labels for training"""
-        # Ensure we have matching lengths
-        min_len = min(len(self.features), len(self.labels))
-        if min_len == 0:
-            return None, None
+    def flush_samples(self, path=None):
+        """Append the queued training samples to the training data file in one write"""
+        if not self.pending_samples:
+            return 0
             
-        X = self.features.iloc[-min_len:]
-        y = self.labels.iloc[-min_len:]
-        
-        return X, y
+        path = path or Config.TRAINING_DATA_PATH
+        is_new = not os.path.exists(path)
+        if is_new and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            
+        samples = pd.concat(self.pending_samples, ignore_index=True)
+        try:
+            samples.to_csv(path, mode='a', header=is_new, index=False)
+        except Exception as e:
+            logger.error(f"Error writing training data: {e}")
+            return 0
+        self.pending_samples = []
+        return len(samples)
@@ -0,0 +1,178 @@
+import time
+import logging
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from multiprocessing import shared_memory, resource_tracker
+from config.settings import Config
+from src.data_manager import DataManager, FEATURE_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+class FeatureBus:
+    """Per-asset tick ring buffers and latest features in shared memory
+
+    One producer process creates the bus and publishes ticks and features;
+    any number of bot processes attach to it by name and read them. Each
+    asset slot is guarded by a sequence lock: the writer makes the sequence
+    odd while it writes and even when done, and readers retry if the
+    sequence was odd or changed while they read.
+
+    Every tick also carries the producer's monotonic ingest time, which is
+    host-wide on Linux, so consumers can measure how stale a tick is
+    including its time on the bus.
+    """
+    def __init__(self, name=None, assets=None, capacity=None, create=False):
+        self.name = name or Config.FEATURE_BUS_NAME
+        self.assets = list(assets or Config.ASSETS)
+        self.capacity = capacity or Config.FEATURE_BUS_CAPACITY
+        self.asset_index = {asset: i for i, asset in enumerate(self.assets)}
+        self.created = create
+
+        n_assets = len(self.assets)
+        n_features = len(FEATURE_COLUMNS)
+        layout = [
+            ('seq', np.uint64, (n_assets,)),
+            ('count', np.uint64, (n_assets,)),
+            ('ticks', np.float64, (n_assets, self.capacity, 3)),  # timestamp, price, volume
+            ('received_ns', np.uint64, (n_assets, self.capacity)),  # Producer's time.monotonic_ns()
+            ('features', np.float64, (n_assets, n_features)),
+        ]
+        size = sum(np.dtype(dtype).itemsize * int(np.prod(shape)) for _, dtype, shape in layout)
+
+        if create:
+            self.shm = shared_memory.SharedMemory(name=self.name, create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=self.name)
+            # Only the producer owns the segment; stop this process's resource
+            # tracker from unlinking it when the consumer exits
+            resource_tracker.unregister(self.shm._name, 'shared_memory')
+
+        offset = 0
+        for field, dtype, shape in layout:
+            array = np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=offset)
+            setattr(self, '_' + field, array)
+            offset += array.nbytes
+
+        if create:
+            self._seq[:] = 0
+            self._count[:] = 0
+            self._received_ns[:] = 0
+            self._features[:] = np.nan
+
+    def publish(self, asset, tick_data, features=None):
+        """Write a tick (and its features, if any) for an asset"""
+        i = self.asset_index[asset]
+        timestamp = tick_data.get('timestamp') or datetime.now()
+        received_ns = tick_data.get('received_ns') or time.monotonic_ns()
+
+        self._seq[i] += 1  # Odd: write in progress
+        count = int(self._count[i])
+        slot = count % self.capacity
+        self._ticks[i, slot] = (timestamp.timestamp(), tick_data['price'], tick_data.get('volume', 0))
+        self._received_ns[i, slot] = received_ns
+        if features is not None:
+            self._features[i] = np.asarray(features, dtype=float).ravel()
+        else:
+            self._features[i] = np.nan
+        self._count[i] = count + 1
+        self._seq[i] += 1  # Even: consistent
+
+    def sequence(self, asset):
+        """Current sequence number of an asset slot (changes on every publish)"""
+        return int(self._seq[self.asset_index[asset]])
+
+    def read_latest(self, asset, max_retries=100):
+        """Read the latest tick and features for an asset
+
+        Returns (seq, tick_data, features) where features is None until the
+        producer has enough history; returns None if nothing was published.
+        """
+        i = self.asset_index[asset]
+        for _ in range(max_retries):
+            seq = int(self._seq[i])
+            if seq % 2:
+                continue
+            count = int(self._count[i])
+            if count == 0:
+                return None
+            slot = (count - 1) % self.capacity
+            timestamp, price, volume = self._ticks[i, slot]
+            received_ns = int(self._received_ns[i, slot])
+            features = self._features[i].copy()
+            if int(self._seq[i]) == seq:
+                break
+        else:
+            return None
+
+        tick_data = {
+            'asset': asset,
+            'price': float(price),
+            'timestamp': datetime.fromtimestamp(timestamp),
+            'volume': float(volume),
+            'received_ns': received_ns
+        }
+        if np.isnan(features).any():
+            return seq, tick_data, None
+        return seq, tick_data, pd.DataFrame([features], columns=FEATURE_COLUMNS)
+
+    def ticks_view(self, asset):
+        """Zero-copy view of an asset's tick ring buffer and its write count
+
+        The view is live shared memory: copy the rows you need and compare
+        sequence() before and after if you need a consistent snapshot.
+        """
+        i = self.asset_index[asset]
+        return self._ticks[i], int(self._count[i])
+
+    def close(self):
+        """Detach from the bus; the producer also unlinks the segment"""
+        for field in ('seq', 'count', 'ticks', 'received_ns', 'features'):
+            setattr(self, '_' + field, None)
+        self.shm.close()
+        if self.created:
+            self.shm.unlink()
+
+class FeatureProducer:
+    """Polls prices for every asset once and publishes ticks and features to the bus"""
+    def __init__(self, client, bus, data_manager=None):
+        self.client = client
+        self.bus = bus
+        self.data_manager = data_manager or DataManager()
+
+    def poll(self):
+        """Fetch one tick per asset and publish it"""
+        for asset in self.bus.assets:
+            tick_data = self.client.get_current_price(asset)
+            if tick_data is None:
+                continue
+            features = self.data_manager.add_tick(tick_data)
+            self.bus.publish(asset, tick_data, None if features is None else features[FEATURE_COLUMNS].values)
+
+def run_producer(demo_mode=True):
+    """Run a feature bus producer until interrupted"""
+    from src.api_client import PocketOptionClient
+    from src.scheduler import Scheduler
+
+    client = PocketOptionClient(demo_mode)
+    if not client.connect():
+        logger.error("Feature bus producer failed to connect to API")
+        return
+
+    bus = FeatureBus(create=True)
+    producer = FeatureProducer(client, bus)
+    scheduler = Scheduler()
+    scheduler.every(Config.TICK_INTERVAL, producer.poll, name="feature_bus_poll")
+    logger.info(f"Feature bus '{bus.name}' publishing {len(bus.assets)} assets")
+    try:
+        scheduler.run()
+    except KeyboardInterrupt:
+        logger.info("Stopping feature bus producer...")
+    finally:
+        bus.close()
+        client.disconnect()
+
+if __name__ == "__main__":
+    from src.logging_setup import setup_logging
+    setup_logging()
+    run_producer()
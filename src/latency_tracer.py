@@ -0,0 +1,91 @@
+import time
+import itertools
+import logging
+import numpy as np
+from collections import deque, defaultdict
+from config.settings import Config
+
+logger = logging.getLogger(__name__)
+
+# Pipeline stages in order, from the tick arriving to the order being acknowledged
+STAGES = ['ingest', 'features', 'prediction', 'risk_check', 'order_submit', 'order_ack']
+
+class Trace:
+    """Monotonic timestamps (ns) of one tick as it moves through the pipeline"""
+    __slots__ = ('trace_id', 'asset', 'price', 'stamps')
+
+    def __init__(self, trace_id, asset, price, ingest_ns):
+        self.trace_id = trace_id
+        self.asset = asset
+        self.price = price
+        self.stamps = {'ingest': ingest_ns}
+
+    def mark(self, stage):
+        self.stamps[stage] = time.monotonic_ns()
+
+    def elapsed_ms(self, stage):
+        """Milliseconds from ingest to a stage (None if not reached)"""
+        if stage not in self.stamps:
+            return None
+        return (self.stamps[stage] - self.stamps['ingest']) / 1e6
+
+class LatencyTracer:
+    """Assigns trace IDs to ticks and collects per-stage latency samples
+
+    Samples are kept in bounded deques, so the tracer can stay on in
+    production; report() summarizes them as percentiles.
+    """
+    def __init__(self, sample_size=None):
+        self.sample_size = sample_size or Config.TRACE_SAMPLE_SIZE
+        self._ids = itertools.count(1)
+        self.stage_samples = defaultdict(lambda: deque(maxlen=self.sample_size))
+        self.total_samples = defaultdict(lambda: deque(maxlen=self.sample_size))
+
+    def start(self, tick_data):
+        """Open a trace for a tick and tag the tick with its trace ID"""
+        ingest_ns = tick_data.get('received_ns') or time.monotonic_ns()
+        trace = Trace(next(self._ids), tick_data.get('asset'), tick_data.get('price'), ingest_ns)
+        tick_data['trace_id'] = trace.trace_id
+        return trace
+
+    def finish(self, trace):
+        """Record the stage-to-stage and tick-to-stage latencies of a trace"""
+        previous = None
+        for stage in STAGES:
+            stamp = trace.stamps.get(stage)
+            if stamp is None:
+                continue
+            if previous is not None:
+                self.stage_samples[stage].append((stamp - previous) / 1e6)
+                self.total_samples[stage].append((stamp - trace.stamps['ingest']) / 1e6)
+            previous = stamp
+
+    def report(self):
+        """Latency percentiles in ms per stage
+
+        'stage' is the time since the previous stage reached; 'since_ingest'
+        is the time since the tick arrived (for order_submit: how stale the
+        price was when the order went out).
+        """
+        def summarize(samples):
+            values = np.fromiter(samples, dtype=float)
+            p50, p90, p99 = np.percentile(values, [50, 90, 99])
+            return {'count': len(values), 'p50': p50, 'p90': p90, 'p99': p99, 'max': values.max()}
+
+        return {
+            stage: {
+                'stage': summarize(self.stage_samples[stage]),
+                'since_ingest': summarize(self.total_samples[stage])
+            }
+            for stage in STAGES if self.stage_samples.get(stage)
+        }
+
+    def format_report(self):
+        """Report as a plain-text table"""
+        lines = [f"{'stage':<14}{'count':>8}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+                 f"{'ingest p50':>12}{'ingest p99':>12}"]
+        for stage, summary in self.report().items():
+            s, t = summary['stage'], summary['since_ingest']
+            lines.append(f"{stage:<14}{s['count']:>8}{s['p50']:>10.3f}{s['p90']:>10.3f}{s['p99']:>10.3f}"
+                         f"{s['max']:>10.3f}{t['p50']:>12.3f}{t['p99']:>12.3f}")
+        return "\n".join(lines)
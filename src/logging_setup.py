@@ -0,0 +1,96 @@
+import os
+import json
+import queue
+import atexit
+import itertools
+import logging
+import logging.handlers
+from datetime import datetime
+from config.settings import Config
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line"""
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        event = getattr(record, 'event', None)
+        if event:
+            entry['event'] = event
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class SamplingFilter(logging.Filter):
+    """Keep only 1 in N records for high-frequency events
+
+    Records opt in with extra={'event': name}; rates maps event names to N.
+    Warnings and errors are never sampled out.
+    """
+    def __init__(self, rates=None):
+        super().__init__()
+        self.rates = rates if rates is not None else Config.LOG_SAMPLE_RATES
+        self._counters = {event: itertools.count() for event in self.rates}
+
+    def filter(self, record):
+        event = getattr(record, 'event', None)
+        if event not in self.rates or record.levelno >= logging.WARNING:
+            return True
+        return next(self._counters[event]) % self.rates[event] == 0
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves message formatting to the listener thread
+
+    The stock handler merges msg % args in the calling thread; here the
+    record is enqueued untouched so the hot path only pays for the put.
+    """
+    def prepare(self, record):
+        return record
+
+def setup_logging(log_file=None, level=None):
+    """Route all logging through a queue to rotating JSON file and console handlers
+
+    Returns the running QueueListener; it is stopped (and flushed) at exit.
+    """
+    log_file = log_file or Config.LOG_FILE
+    directory = os.path.dirname(log_file)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    if Config.LOG_ROTATE_WHEN:
+        file_handler = logging.handlers.TimedRotatingFileHandler(
+            log_file, when=Config.LOG_ROTATE_WHEN, backupCount=Config.LOG_BACKUP_COUNT
+        )
+    else:
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=Config.LOG_MAX_BYTES, backupCount=Config.LOG_BACKUP_COUNT
+        )
+    file_handler.setFormatter(JsonFormatter())
+
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter())
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level or Config.LOG_LEVEL)
+
+    listener = logging.handlers.QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(stop_logging, listener)
+    return listener
+
+def stop_logging(listener):
+    """Flush queued records and stop the listener (safe to call twice)"""
+    if listener._thread is not None:
+        listener.stop()
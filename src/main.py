@@ -1,8 +1,6 @@
-import pandas as pd
 import numpy as np
-import time
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime
 import matplotlib.pyplot as plt
 import warnings
 warnings.filterwarnings('ignore')
@@ -14,27 +12,44 @@ from src.trading_model import TradingModel
 from src.risk_manager import RiskManager
 from src.api_client import PocketOptionClient
 from src.telegram_bot import TelegramBot
+from src.market_clock import MarketClock
+from src.scheduler import Scheduler
+from src.trade_journal import TradeJournal
+from src.logging_setup import setup_logging
+from src.performance_analytics import StatsServer
+from src.feature_bus import FeatureBus
+from src.latency_tracer import LatencyTracer
+from src.memory_monitor import MemoryMonitor
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/trading_bot.log'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
 class OTCTradingBot:
-    def __init__(self, demo_mode=True):
+    def __init__(self, demo_mode=True, client=None, use_journal=None, record_training_data=None,
+                 stats_port=None):
         self.demo_mode = demo_mode
-        self.client = PocketOptionClient(demo_mode)
-        self.data_manager = DataManager()
+        self.client = client or PocketOptionClient(demo_mode)
+        self.clock = MarketClock()
+        self.data_manager = DataManager(self.clock)
         self.model = TradingModel()
-        self.risk_manager = RiskManager()
+        if use_journal is None:
+            use_journal = Config.JOURNAL_ENABLED
+        self.journal = TradeJournal() if use_journal else None
+        self.risk_manager = RiskManager(self.clock, self.journal)
+        if record_training_data is None:
+            record_training_data = Config.RECORD_TRAINING_DATA
+        self.record_training_data = record_training_data
         self.telegram_bot = TelegramBot()
+        self.memory_monitor = MemoryMonitor()
+        self.stats_server = (
+            StatsServer(self.risk_manager.analytics, self.memory_monitor, port=stats_port)
+            if Config.STATS_ENABLED else None
+        )
+        self.scheduler = Scheduler(on_error=self.handle_job_error, error_delay=Config.ERROR_RETRY_DELAY)
+        self.feature_bus = None
+        self.tracer = LatencyTracer()
+        self.feature_bus_seq = {}
         self.trade_count = 0
+        self.last_checkpoint_trade_count = 0
         self.running = False
         self.current_asset = Config.ASSETS[0]
         
@@ -46,6 +61,14 @@ class OTCTradingBot:
                 self.telegram_bot.send_error_alert("Failed to connect to trading API")
                 return False
                 
+            if Config.FEATURE_BUS_ENABLED:
+                try:
+                    self.feature_bus = FeatureBus()
+                    logger.info(f"Attached to feature bus '{self.feature_bus.name}'")
+                except FileNotFoundError:
+                    logger.error(f"Feature bus '{Config.FEATURE_BUS_NAME}' not found. Is the producer running?")
+                    return False
+                    
             logger.info("Initializing trading bot...")
             logger.info(f"Starting balance: ${self.risk_manager.balance:.2f}")
             
@@ -74,128 +97,198 @@ class OTCTradingBot:
         self.running = True
         logger.info("Starting trading bot...")
         
-        last_report_time = datetime.now()
-        last_retrain_time = datetime.now()
+        # Each job runs on its own timer; the scheduler sleeps until the next one is due
+        self.scheduler.every(Config.TICK_INTERVAL, self.process_tick, name="tick")
+        self.scheduler.every(Config.CHECKPOINT_SECONDS, self.checkpoint_model, name="checkpoint",
+                             delay=Config.CHECKPOINT_SECONDS)
+        self.scheduler.every(3600, self.log_status, name="status", delay=3600)
+        self.scheduler.every(Config.MEMORY_SAMPLE_SECONDS, self.memory_monitor.sample, name="memory")
+        self.scheduler.daily(Config.DAILY_REPORT_TIME, self.generate_daily_report, name="daily_report")
         
-        while self.running:
-            try:
-                current_time = datetime.now()
-                current_time_obj = current_time.time()
-                start_time = Config.TRADING_HOURS["start"]
-                end_time = Config.TRADING_HOURS["end"]
-                
-                # Check if we're within trading hours
-                if not (start_time <= current_time_obj <= end_time):
-                    # Outside trading hours, sleep longer
-                    if (datetime.now() - last_report_time).seconds > 3600:  # Every hour
-                        logger.info("Outside trading hours. Sleeping...")
-                        last_report_time = datetime.now()
-                    time.sleep(300)  # Sleep for 5 minutes
-                    continue
-                
-                # Rotate assets periodically
-                if self.trade_count % 10 == 0:
-                    self.current_asset = np.random.choice(Config.ASSETS)
-                    logger.info(f"Switched to asset: {self.current_asset}")
-                
-                # Get current market price
-                tick_data = self.client.get_current_price(self.current_asset)
-                if tick_data is None:
-                    time.sleep(1)
-                    continue
-                
-                # Process the tick and generate features
-                features = self.data_manager.add_tick(tick_data)
+        if self.stats_server is not None:
+            self.stats_server.start()
+        
+        try:
+            self.scheduler.run()
+        except KeyboardInterrupt:
+            logger.info("Stopping bot...")
+        self.running = False
+        
+        # Save model and flush the trade journal and training data before shutting down
+        self.model.save_model('data/models/trading_model.pkl')
+        self.data_manager.flush_samples()
+        self.risk_manager.flush_spill()
+        if self.journal is not None:
+            self.journal.close()
+        if self.stats_server is not None:
+            self.stats_server.stop()
+        if self.feature_bus is not None:
+            self.feature_bus.close()
+            self.feature_bus = None
+        self.generate_report()
+        
+    def stop(self):
+        """Stop the trading loop"""
+        self.scheduler.stop()
+        
+    def process_tick(self):
+        """Process one market tick (returns seconds until the session opens when closed)"""
+        self.clock.update()
+        
+        # Check if any asset's session is open (sessions can differ per asset)
+        open_assets = self.clock.open_assets(Config.ASSETS)
+        if not open_assets:
+            # Outside trading hours, sleep until the first session opens
+            next_open = self.clock.next_any_session_open(Config.ASSETS)
+            if next_open is None:
+                return 3600
+            return (next_open - self.clock.now).total_seconds()
+        
+        # Rotate assets periodically, and away from an asset whose session closed
+        if self.trade_count % 10 == 0 or self.current_asset not in open_assets:
+            self.current_asset = np.random.choice(open_assets)
+            logger.info("Switched to asset: %s", self.current_asset, extra={'event': 'asset_switch'})
+        
+        # Get current market price and features
+        tick_data, features = self.get_market_data()
+        if tick_data is None:
+            return None
+        
+        self.process_market_data(tick_data, features)
+        return None
+        
+    def process_market_data(self, tick_data, features):
+        """Run one tick through prediction, risk checks and order placement"""
+        trace = self.tracer.start(tick_data)
+        trace.mark('features')
+        
+        if features is not None:
+            # Make prediction if we have enough data
+            prediction = self.model.predict(features)
+            trace.mark('prediction')
+            
+            # Determine trade direction and how confident we are in it
+            direction, confidence = self.model.get_direction(prediction)
+            
+            # Check if we can trade based on risk rules
+            allowed = self.risk_manager.can_trade(confidence, self.current_asset)
+            trace.mark('risk_check')
+            if allowed:
+                # Send signal to Telegram
+                self.telegram_bot.send_signal(
+                    self.current_asset, 
+                    direction, 
+                    confidence, 
+                    tick_data['price']
+                )
                 
-                if features is not None:
-                    # Make prediction if we have enough data
-                    prediction = self.model.predict(features)
+                # Place the trade; the exposure is held until the trade settles
+                self.risk_manager.open_position(self.current_asset)
+                trade_record = None
+                try:
+                    trace.mark('order_submit')
+                    trade_result = self.client.place_trade(
+                        self.current_asset, 
+                        Config.TRADE_AMOUNT, 
+                        direction, 
+                        Config.EXPIRY_TIME,
+                        trace_id=trace.trace_id
+                    )
+                    trace.mark('order_ack')
                     
-                    # Check if we can trade based on risk rules
-                    if self.risk_manager.can_trade(prediction):
-                        # Determine trade direction based on prediction
-                        direction = "call" if prediction > 0.5 else "put"
-                        
-                        # Send signal to Telegram
-                        self.telegram_bot.send_signal(
-                            self.current_asset, 
-                            direction, 
-                            prediction, 
-                            tick_data['price']
-                        )
-                        
-                        # Place the trade
-                        trade_result = self.client.place_trade(
-                            self.current_asset, 
-                            Config.TRADE_AMOUNT, 
-                            direction, 
-                            Config.EXPIRY_TIME
+                    if trade_result.get('success', False):
+                        # Record the trade (this releases its position)
+                        trade_record = self.risk_manager.record_trade(
+                            Config.TRADE_AMOUNT,
+                            trade_result['outcome'],
+                            trade_result['payout'],
+                            asset=self.current_asset,
+                            confidence=confidence,
+                            trace_id=trace.trace_id,
+                            tick_price=trace.price,
+                            staleness_ms=trace.elapsed_ms('order_submit')
                         )
-                        
-                        if trade_result.get('success', False):
-                            # Record the trade
-                            self.trade_count += 1
-                            outcome = 1 if trade_result['outcome'] == 'win' else 0
-                            trade_record = self.risk_manager.record_trade(
-                                Config.TRADE_AMOUNT,
-                                trade_result['outcome'],
-                                trade_result['payout']
-                            )
-                            
-                            # Add to training data
-                            self.data_manager.add_label(outcome)
-                            
-                            # Send result to Telegram
-                            self.telegram_bot.send_trade_result(
-                                self.trade_count,
-                                trade_result['outcome'],
-                                trade_result['payout'],
-                                self.risk_manager.balance,
-                                prediction
-                            )
-                            
-                            logger.info(
-                                f"Trade #{self.trade_count}: {trade_result['outcome'].upper()}! "
-                                f"Profit: ${trade_result['payout']:.2f} | "
-                                f"Balance: ${self.risk_manager.balance:.2f} | "
-                                f"Confidence: {prediction:.2%}"
-                            )
-                            
-                            # Retrain model periodically (but not too often)
-                            if (datetime.now() - last_retrain_time).seconds > 300:  # Every 5 minutes
-                                X, y = self.data_manager.get_training_data()
-                                if X is not None and y is not None and len(X) >= Config.WARMUP_PERIOD:
-                                    logger.info("Retraining model...")
-                                    if self.model.train(X, y):
-                                        last_retrain_time = datetime.now()
-                                        # Save model after training
-                                        self.model.save_model('data/models/trading_model.pkl')
-                    
-                # Send daily report at the end of the day
-                if current_time.hour == 23 and current_time.minute >= 55:
-                    if (datetime.now() - last_report_time).seconds > 300:  # Only once every 5 minutes
-                        self.generate_daily_report()
-                        last_report_time = datetime.now()
+                finally:
+                    if trade_record is None:
+                        # Release the exposure held for a rejected or failed order
+                        self.risk_manager.close_position(self.current_asset)
                 
-                # Wait before next tick
-                time.sleep(1)
-                
-            except KeyboardInterrupt:
-                logger.info("Stopping bot...")
-                self.running = False
-            except Exception as e:
-                logger.error(f"Error in trading loop: {e}")
-                self.telegram_bot.send_error_alert(str(e))
-                time.sleep(5)
+                if trade_record is not None:
+                    self.trade_count += 1
+                    outcome = 1 if trade_result['outcome'] == 'win' else 0
+                    # The model predicts P(call wins), so a winning put is a 0 label
+                    label = outcome if direction == "call" else 1 - outcome
+                    
+                    # Update the model incrementally and keep the labeled sample for offline training
+                    self.model.update(features, label, won=outcome)
+                    if self.record_training_data:
+                        self.data_manager.record_sample(features, label)
+                    
+                    # Send result to Telegram
+                    self.telegram_bot.send_trade_result(
+                        self.trade_count,
+                        trade_result['outcome'],
+                        trade_result['payout'],
+                        self.risk_manager.balance,
+                        confidence
+                    )
+                    
+                    logger.info(
+                        "Trade #%d: %s! Profit: $%.2f | Balance: $%.2f | Confidence: %.2f%%",
+                        self.trade_count,
+                        trade_result['outcome'].upper(),
+                        trade_result['payout'],
+                        self.risk_manager.balance,
+                        confidence * 100,
+                        extra={'event': 'trade'}
+                    )
+        
+        self.tracer.finish(trace)
+        
+    def get_market_data(self):
+        """Get the latest tick and features for the current asset
+        
+        Reads from the shared feature bus when enabled, otherwise polls the
+        API and computes features locally. Returns (None, None) if there is
+        no new tick.
+        """
+        if self.feature_bus is None:
+            tick_data = self.client.get_current_price(self.current_asset)
+            if tick_data is None:
+                return None, None
+            return tick_data, self.data_manager.add_tick(tick_data)
+            
+        latest = self.feature_bus.read_latest(self.current_asset)
+        if latest is None or latest[0] == self.feature_bus_seq.get(self.current_asset):
+            return None, None
+        seq, tick_data, features = latest
+        self.feature_bus_seq[self.current_asset] = seq
+        self.clock.update(tick_data['timestamp'])
+        return tick_data, features
+        
+    def checkpoint_model(self):
+        """Flush queued training samples and spilled trades, and save the model if it learned since the last checkpoint"""
+        self.data_manager.flush_samples()
+        self.risk_manager.flush_spill()
+        if self.trade_count == self.last_checkpoint_trade_count:
+            return
+            
+        if self.model.save_model('data/models/trading_model.pkl'):
+            self.last_checkpoint_trade_count = self.trade_count
                 
-        # Save model before shutting down
-        self.model.save_model('data/models/trading_model.pkl')
-        self.generate_report()
+    def log_status(self):
+        """Log a reminder every hour while the market is closed"""
+        if not self.clock.open_assets(Config.ASSETS):
+            logger.info("Outside trading hours. Sleeping...")
+            
+    def handle_job_error(self, job, error):
+        """Send an alert when a scheduled job fails"""
+        self.telegram_bot.send_error_alert(str(error))
         
     def generate_daily_report(self):
         """Generate and send daily performance report"""
         # Get today's trades
-        today = datetime.now().date()
+        today = self.clock.date or datetime.now().date()
         todays_trades = self.risk_manager.get_daily_trades(today)
         
         if not todays_trades:
@@ -203,13 +296,18 @@ class OTCTradingBot:
             
         wins = [t for t in todays_trades if t['outcome'] == 'win']
         total_profit = sum(t['profit'] for t in todays_trades)
+        stats = self.risk_manager.get_performance_stats()
         
         report_data = {
             'total_trades': len(todays_trades),
             'winning_trades': len(wins),
             'win_rate': (len(wins) / len(todays_trades)) * 100 if todays_trades else 0,
             'total_profit': total_profit,
-            'ending_balance': self.risk_manager.balance
+            'ending_balance': self.risk_manager.balance,
+            'rolling_win_rate': stats['rolling_win_rate'],
+            'rolling_sharpe': stats['rolling_sharpe'],
+            'max_drawdown': stats['max_drawdown'],
+            'calibration': stats['calibration']
         }
         
         self.telegram_bot.send_daily_report(report_data)
@@ -243,21 +341,27 @@ class OTCTradingBot:
             times = [t['time'] for t in self.risk_manager.trades]
             balances = [t['balance'] for t in self.risk_manager.trades]
             
-            plt.figure(figsize=(10, 5))
-            plt.plot(times, balances)
-            plt.title('Account Balance Over Time')
-            plt.xlabel('Time')
-            plt.ylabel('Balance ($)')
-            plt.grid(True)
-            plt.xticks(rotation=45)
-            plt.tight_layout()
-            plt.savefig('logs/balance_chart.png')
+            fig = plt.figure(figsize=(10, 5))
+            try:
+                plt.plot(times, balances)
+                plt.title('Account Balance Over Time')
+                plt.xlabel('Time')
+                plt.ylabel('Balance ($)')
+                plt.grid(True)
+                plt.xticks(rotation=45)
+                plt.tight_layout()
+                plt.savefig('logs/balance_chart.png')
+            finally:
+                plt.close(fig)
             logger.info("Balance chart saved as 'logs/balance_chart.png'")
 
 # =============================================================================
 # EXECUTION STARTS HERE
 # =============================================================================
 if __name__ == "__main__":
+    # Route logging through the background queue listener
+    setup_logging()
+    
     # Initialize the bot in demo mode
     bot = OTCTradingBot(demo_mode=True)
     
@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta
+import logging
+from config.settings import Config
+
+logger = logging.getLogger(__name__)
+
+class MarketClock:
+    """Cached view of the current time and trading session state
+
+    The clock is driven by tick timestamps rather than the wall clock, so
+    backtests and replays can run faster than real time. Time buckets and
+    session checks are only recomputed when a timestamp crosses into a new
+    minute; sessions therefore have one-minute resolution.
+    """
+    def __init__(self, trading_hours=None, sessions=None, holidays=None):
+        self.trading_hours = trading_hours or Config.TRADING_HOURS
+        self.sessions = sessions if sessions is not None else Config.ASSET_SESSIONS
+        self.holidays = set(holidays if holidays is not None else Config.HOLIDAYS)
+
+        self.now = None
+        self.generation = 0  # Incremented every time a new minute starts
+        self.date = None
+        self.hour = 0
+        self.minute = 0
+        self.weekday = 0
+        self.time_features = {}
+        self._minute_start = None
+        self._minute_end = None
+        self._session_cache = {}
+
+    def update(self, timestamp=None):
+        """Advance the clock to a tick timestamp (default: wall clock)"""
+        if timestamp is None:
+            timestamp = datetime.now()
+        self.now = timestamp
+
+        # Fast path: still inside the cached minute
+        if self._minute_start is not None and self._minute_start <= timestamp < self._minute_end:
+            return False
+
+        self._refresh(timestamp)
+        return True
+
+    def _refresh(self, timestamp):
+        """Recompute time buckets for the minute containing timestamp"""
+        self.generation += 1
+        self._minute_start = timestamp.replace(second=0, microsecond=0)
+        self._minute_end = self._minute_start + timedelta(minutes=1)
+        self.date = self._minute_start.date()
+        self.hour = self._minute_start.hour
+        self.minute = self._minute_start.minute
+        self.weekday = self._minute_start.weekday()
+        self.time_features = {
+            'hour_of_day': self.hour,
+            'minute_of_hour': self.minute,
+            'day_of_week': self.weekday
+        }
+        self._session_cache = {}
+
+    def get_session(self, asset=None):
+        """Get the trading hours that apply to an asset"""
+        if asset is not None and asset in self.sessions:
+            return self.sessions[asset]
+        return self.trading_hours
+
+    def is_holiday(self, asset=None):
+        """Check if the current date is a holiday (globally or for an asset)"""
+        if self.date in self.holidays:
+            return True
+        session = self.get_session(asset)
+        return self.date in session.get("holidays", ())
+
+    def is_trading_hours(self, asset=None):
+        """Check if the session for an asset is open at the current minute"""
+        if self._minute_start is None:
+            self.update()
+
+        is_open = self._session_cache.get(asset)
+        if is_open is None:
+            session = self.get_session(asset)
+            current_time_obj = self._minute_start.time()
+            is_open = (
+                not self.is_holiday(asset)
+                and self.weekday in session.get("weekdays", range(7))
+                and session["start"] <= current_time_obj <= session["end"]
+            )
+            self._session_cache[asset] = is_open
+
+        return is_open
+
+    def next_session_open(self, asset=None, max_days=14):
+        """Get the datetime the session for an asset next opens (now if open)"""
+        if self._minute_start is None:
+            self.update()
+        if self.is_trading_hours(asset):
+            return self.now
+
+        session = self.get_session(asset)
+        weekdays = session.get("weekdays", range(7))
+        holidays = self.holidays | set(session.get("holidays", ()))
+        for offset in range(max_days + 1):
+            day = self.date + timedelta(days=offset)
+            if day in holidays or day.weekday() not in weekdays:
+                continue
+            session_open = datetime.combine(day, session["start"])
+            if session_open > self.now:
+                return session_open
+        return None
+
+    def open_assets(self, assets):
+        """Assets whose session is open at the current minute"""
+        return [asset for asset in assets if self.is_trading_hours(asset)]
+
+    def next_any_session_open(self, assets):
+        """Earliest next session open across assets (the union of their sessions)"""
+        opens = [t for t in (self.next_session_open(asset) for asset in assets) if t is not None]
+        return min(opens) if opens else None
@@ -0,0 +1,77 @@
+import os
+import gc
+import threading
+import tracemalloc
+import logging
+from collections import deque
+from datetime import datetime
+from config.settings import Config
+
+logger = logging.getLogger(__name__)
+
+def get_rss_bytes():
+    """Current resident set size of this process in bytes
+
+    Reads /proc/self/statm on Linux; elsewhere falls back to the peak RSS
+    reported by getrusage.
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and kilobytes on Linux/BSD
+        return peak if os.uname().sysname == 'Darwin' else peak * 1024
+
+class MemoryMonitor:
+    """Periodic memory telemetry: RSS trend, GC counts and top allocators"""
+    def __init__(self, history=None, tracemalloc_enabled=None, top_n=None):
+        self.samples = deque(maxlen=history or Config.MEMORY_HISTORY)
+        self.tracemalloc_enabled = (
+            tracemalloc_enabled if tracemalloc_enabled is not None else Config.MEMORY_TRACEMALLOC
+        )
+        self.top_n = top_n or Config.MEMORY_TOP_ALLOCATORS
+        self.top_allocators = []
+        self._lock = threading.Lock()
+        if self.tracemalloc_enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def sample(self):
+        """Take one memory sample and return it"""
+        sample = {
+            'time': datetime.now(),
+            'rss_mb': get_rss_bytes() / 1e6,
+            'gc_objects': len(gc.get_objects()),
+        }
+        top = []
+        if self.tracemalloc_enabled and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            sample['traced_mb'] = current / 1e6
+            sample['traced_peak_mb'] = peak / 1e6
+            stats = tracemalloc.take_snapshot().statistics('lineno')[:self.top_n]
+            top = [{'location': str(stat.traceback), 'size_kb': stat.size / 1e3, 'count': stat.count}
+                   for stat in stats]
+
+        with self._lock:
+            self.samples.append(sample)
+            if top:
+                self.top_allocators = top
+        logger.info("Memory: RSS %.1f MB, %d GC objects", sample['rss_mb'], sample['gc_objects'])
+        return sample
+
+    def rss_growth_mb(self):
+        """RSS change between the oldest and newest retained samples"""
+        with self._lock:
+            if len(self.samples) < 2:
+                return 0.0
+            return self.samples[-1]['rss_mb'] - self.samples[0]['rss_mb']
+
+    def get_stats(self):
+        """Latest sample, RSS trend and top allocators (for the stats endpoint)"""
+        with self._lock:
+            return {
+                'latest': self.samples[-1] if self.samples else None,
+                'rss_mb_history': [round(s['rss_mb'], 2) for s in self.samples],
+                'top_allocators': list(self.top_allocators)
+            }
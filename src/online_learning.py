@@ -0,0 +1,226 @@
+import numpy as np
+from collections import deque
+from sklearn.base import BaseEstimator, ClassifierMixin, clone
+from sklearn.linear_model import SGDClassifier
+import logging
+from config.settings import Config
+from src.data_manager import FEATURE_COLUMNS, CALENDAR_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+class PageHinkley:
+    """Page-Hinkley test for an increase in the mean of a stream
+
+    Fed with the per-trade error (1 for a loss, 0 for a win), it flags
+    drift when the win rate drops and stays down.
+    """
+    def __init__(self, delta=None, threshold=None, min_instances=None):
+        self.delta = delta if delta is not None else Config.DRIFT_DELTA
+        self.threshold = threshold if threshold is not None else Config.DRIFT_THRESHOLD
+        self.min_instances = min_instances if min_instances is not None else Config.DRIFT_MIN_INSTANCES
+        self.reset()
+
+    def reset(self):
+        self.n = 0
+        self.mean = 0.0
+        self.cumulative = 0.0
+        self.minimum = 0.0
+
+    def update(self, value):
+        """Add an observation; returns True when drift is detected"""
+        self.n += 1
+        self.mean += (value - self.mean) / self.n
+        self.cumulative += value - self.mean - self.delta
+        self.minimum = min(self.minimum, self.cumulative)
+
+        if self.n >= self.min_instances and self.cumulative - self.minimum > self.threshold:
+            self.reset()
+            return True
+        return False
+
+class IncrementalGaussianNB(ClassifierMixin, BaseEstimator):
+    """Gaussian naive Bayes that can learn one row at a time
+
+    sklearn's GaussianNB derives its variance smoothing from each
+    partial_fit batch, which is zero for a single row, so a feature that is
+    constant within a class pushes its probabilities to 0/1 or NaN. Here
+    the per-class means and variances are running estimates with a fixed
+    floor, and columns selects the features that are modelled.
+    """
+    def __init__(self, var_floor=None, columns=None):
+        self.var_floor = var_floor
+        self.columns = columns
+
+    def _select(self, X):
+        X = np.asarray(X, dtype=float)
+        return X if self.columns is None else X[:, self.columns]
+
+    def partial_fit(self, X, y, classes=None):
+        X = self._select(X)
+        y = np.asarray(y)
+        if not hasattr(self, 'classes_'):
+            self.classes_ = np.asarray(classes if classes is not None else np.unique(y))
+            self.class_count_ = np.zeros(len(self.classes_))
+            self.theta_ = np.zeros((len(self.classes_), X.shape[1]))
+            self.sum_sq_ = np.zeros((len(self.classes_), X.shape[1]))
+
+        for i, cls in enumerate(self.classes_):
+            X_cls = X[y == cls]
+            if len(X_cls) == 0:
+                continue
+            # Merge the batch into the running mean and sum of squared deviations
+            n_old, n_new = self.class_count_[i], len(X_cls)
+            n_total = n_old + n_new
+            batch_mean = X_cls.mean(axis=0)
+            delta = batch_mean - self.theta_[i]
+            self.theta_[i] += delta * n_new / n_total
+            self.sum_sq_[i] += ((X_cls - batch_mean) ** 2).sum(axis=0) + delta ** 2 * n_old * n_new / n_total
+            self.class_count_[i] = n_total
+        return self
+
+    @property
+    def var_(self):
+        floor = self.var_floor if self.var_floor is not None else Config.ENSEMBLE_NB_VAR_FLOOR
+        seen = self.class_count_[:, None] > 0
+        var = self.sum_sq_ / np.maximum(self.class_count_, 1)[:, None] + floor
+        return np.where(seen, var, 1.0)  # Unseen classes get a unit Gaussian
+
+    def predict_proba(self, X):
+        X = self._select(X)
+        var = self.var_
+        log_prior = np.log((self.class_count_ + 1) / (self.class_count_.sum() + len(self.classes_)))
+        log_likelihood = -0.5 * (
+            np.log(2 * np.pi * var).sum(axis=1)
+            + (((X[:, None, :] - self.theta_) ** 2) / var).sum(axis=2)
+        )
+        joint = log_prior + log_likelihood
+        joint -= joint.max(axis=1, keepdims=True)
+        proba = np.exp(joint)
+        return proba / proba.sum(axis=1, keepdims=True)
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+class OnlineEnsemble:
+    """Small ensemble of incremental classifiers weighted by recent accuracy
+
+    Exposes partial_fit/predict_proba like a single sklearn classifier so
+    TradingModel can use it in place of its SGDClassifier. Every member is
+    scored on each sample before learning from it (prequential), and the
+    score feeds an exponential moving accuracy used as its vote weight.
+
+    A seed model (e.g. a batch classifier from the training pipeline) votes
+    alongside the members without being updated, and is dropped once drift
+    shows its concept has gone stale.
+    """
+    classes_ = np.array([0, 1])
+
+    def __init__(self, members=None, decay=None, replay_size=None, seed=None):
+        if members is None:
+            members = [
+                SGDClassifier(loss='log_loss', learning_rate='optimal', eta0=0.1, random_state=42),
+                IncrementalGaussianNB(columns=[i for i, column in enumerate(FEATURE_COLUMNS)
+                                               if column not in CALENDAR_COLUMNS])
+            ]
+        self.prototypes = members
+        self.decay = decay if decay is not None else Config.ENSEMBLE_DECAY
+        self.replay = deque(maxlen=replay_size or Config.TICK_HISTORY)
+        self.drift_detector = PageHinkley()
+        self.drift_count = 0
+        self.seed = seed
+        self.seed_accuracy = 0.5
+        self.reset()
+
+    def reset(self):
+        """Replace every member with an untrained copy"""
+        self.members = [clone(m) for m in self.prototypes]
+        self.accuracy = np.full(len(self.members), 0.5)
+        self.fitted = False
+        self.samples_seen = 0
+
+    @property
+    def weights(self):
+        return self.accuracy / self.accuracy.sum()
+
+    def _voters(self):
+        """Models that currently vote and their accuracy weights
+
+        Next to a seed, members only vote once they have seen WARMUP_PERIOD samples.
+        """
+        ready = self.fitted and (self.seed is None or self.samples_seen >= Config.WARMUP_PERIOD)
+        voters = list(self.members) if ready else []
+        accuracy = list(self.accuracy) if ready else []
+        if self.seed is not None:
+            voters.append(self.seed)
+            accuracy.append(self.seed_accuracy)
+        if not voters:
+            return voters, np.empty(0)
+        accuracy = np.array(accuracy)
+        return voters, accuracy / accuracy.sum()
+
+    def partial_fit(self, X, y, classes=None):
+        """Batch update without touching the accuracy weights"""
+        X = np.asarray(X, dtype=float)
+        y = np.asarray(y)
+        for member in self.members:
+            member.partial_fit(X, y, classes=self.classes_)
+        self.replay.extend(zip(X, y))
+        self.fitted = True
+        self.samples_seen += len(X)
+        return self
+
+    def predict_proba(self, X):
+        X = np.asarray(X, dtype=float)
+        voters, weights = self._voters()
+        if not voters:
+            return np.full((len(X), 2), 0.5)
+        member_proba = np.stack([m.predict_proba(X)[:, 1] for m in voters])
+        # A member that has broken down abstains instead of poisoning the vote
+        member_proba = np.where(np.isfinite(member_proba), member_proba, 0.5)
+        proba = weights @ member_proba
+        return np.column_stack([1 - proba, proba])
+
+    def learn_one(self, x, label, outcome_error=None):
+        """Learn from one labeled sample; returns True if drift was detected
+
+        outcome_error is the trade's realized error (1 for a loss) fed to the
+        drift detector; it defaults to the ensemble's own misclassification.
+        """
+        x = np.asarray(x, dtype=float).reshape(1, -1)
+        y = np.array([label])
+
+        if self.fitted:
+            hits = np.array([m.predict(x)[0] == label for m in self.members], dtype=float)
+            self.accuracy = self.decay * self.accuracy + (1 - self.decay) * hits
+        if self.seed is not None:
+            hit = float(self.seed.predict(x)[0] == label)
+            self.seed_accuracy = self.decay * self.seed_accuracy + (1 - self.decay) * hit
+        if self.fitted or self.seed is not None:
+            if outcome_error is None:
+                outcome_error = float(self.predict_proba(x)[0, 1] >= 0.5) != label
+
+        for member in self.members:
+            member.partial_fit(x, y, classes=self.classes_)
+        self.replay.append((x[0], label))
+        self.fitted = True
+        self.samples_seen += 1
+
+        if outcome_error is not None and self.drift_detector.update(float(outcome_error)):
+            self.drift_count += 1
+            logger.warning(f"Concept drift detected (#{self.drift_count}). Resetting ensemble.")
+            self.seed = None
+            self.refit_recent(Config.DRIFT_RETRAIN_WINDOW)
+            return True
+        return False
+
+    def refit_recent(self, window):
+        """Reset the members and refit them on the most recent labeled samples"""
+        recent = list(self.replay)[-window:]
+        self.reset()
+        if recent:
+            X = np.array([x for x, _ in recent])
+            y = np.array([label for _, label in recent])
+            for member in self.members:
+                member.partial_fit(X, y, classes=self.classes_)
+            self.fitted = True
+            self.samples_seen = len(recent)
@@ -0,0 +1,207 @@
+import json
+import math
+import threading
+import logging
+from collections import deque, defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from config.settings import Config
+
+logger = logging.getLogger(__name__)
+
+class _Bucket:
+    """Running counters for one slice of trades (asset, hour or confidence)"""
+    __slots__ = ('trades', 'wins', 'profit', 'predicted')
+
+    def __init__(self):
+        self.trades = 0
+        self.wins = 0
+        self.profit = 0.0
+        self.predicted = 0.0
+
+    def add(self, win, profit, confidence):
+        self.trades += 1
+        self.wins += win
+        self.profit += profit
+        self.predicted += confidence or 0.0
+
+    def to_dict(self):
+        return {
+            'trades': self.trades,
+            'win_rate': (self.wins / self.trades) * 100 if self.trades else 0,
+            'profit': self.profit,
+            'predicted_win_rate': (self.predicted / self.trades) * 100 if self.trades else 0
+        }
+
+class PerformanceAnalytics:
+    """Incremental performance metrics, each updated in O(1) per trade
+
+    Keeps a rolling Sharpe-like ratio of per-trade returns, drawdown from
+    the balance peak, win rates by asset / hour / confidence bucket, and
+    model calibration (mean predicted confidence vs realized win rate per
+    confidence bucket).
+    """
+    def __init__(self, initial_balance=None, window=None, bucket_width=None):
+        self.initial_balance = initial_balance if initial_balance is not None else Config.INITIAL_BALANCE
+        self.window = window or Config.ANALYTICS_WINDOW
+        self.bucket_width = bucket_width or Config.CONFIDENCE_BUCKET_WIDTH
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.total_trades = 0
+        self.wins = 0
+        self.total_profit = 0.0
+        self.peak_balance = self.initial_balance
+        self.balance = self.initial_balance
+        self.max_drawdown = 0.0
+        self._returns = deque()
+        self._return_sum = 0.0
+        self._return_sq_sum = 0.0
+        self._rolling_wins = 0
+        self.by_asset = defaultdict(_Bucket)
+        self.by_hour = defaultdict(_Bucket)
+        self.by_confidence = defaultdict(_Bucket)
+
+    def confidence_bucket(self, confidence):
+        """Lower edge of the confidence bucket, e.g. 0.65 for 0.67"""
+        return round(math.floor(confidence / self.bucket_width) * self.bucket_width, 2)
+
+    def record(self, trade_record):
+        """Update every metric with one trade record from RiskManager"""
+        win = 1 if trade_record['outcome'] == 'win' else 0
+        profit = trade_record['profit']
+        amount = trade_record['amount']
+        trade_return = profit / amount if amount else 0.0
+        confidence = trade_record.get('confidence')
+
+        with self._lock:
+            self.total_trades += 1
+            self.wins += win
+            self.total_profit += profit
+
+            # Drawdown from the running balance peak
+            self.balance = trade_record['balance']
+            self.peak_balance = max(self.peak_balance, self.balance)
+            self.max_drawdown = max(self.max_drawdown, self.peak_balance - self.balance)
+
+            self._add_return(trade_return, win)
+
+            self.by_asset[trade_record.get('asset') or 'UNKNOWN'].add(win, profit, confidence)
+            self.by_hour[trade_record['time'].hour].add(win, profit, confidence)
+            if confidence is not None:
+                self.by_confidence[self.confidence_bucket(confidence)].add(win, profit, confidence)
+
+    def _add_return(self, trade_return, win):
+        """Push one trade into the rolling window of per-trade returns"""
+        self._returns.append((trade_return, win))
+        self._return_sum += trade_return
+        self._return_sq_sum += trade_return * trade_return
+        self._rolling_wins += win
+        if len(self._returns) > self.window:
+            old_return, old_win = self._returns.popleft()
+            self._return_sum -= old_return
+            self._return_sq_sum -= old_return * old_return
+            self._rolling_wins -= old_win
+
+    def restore(self, totals, recent_trades):
+        """Rebuild the metrics after a restart
+
+        totals holds the lifetime counters aggregated over the whole journal
+        (TradeJournal.aggregate_stats); recent_trades only refill the rolling
+        window, so they can be a bounded tail of the history.
+        """
+        with self._lock:
+            self.reset()
+            self.total_trades = totals['trades']
+            self.wins = totals['wins']
+            self.total_profit = totals['profit']
+            self.balance = totals['balance']
+            self.peak_balance = max(self.initial_balance, totals['peak_balance'])
+            self.max_drawdown = totals['max_drawdown']
+            for table, rows in ((self.by_asset, totals['by_asset']),
+                                (self.by_hour, totals['by_hour']),
+                                (self.by_confidence, totals['by_confidence'])):
+                for key, trades, wins, profit, predicted in rows:
+                    bucket = table[key]
+                    bucket.trades, bucket.wins, bucket.profit, bucket.predicted = trades, wins, profit, predicted
+
+            for trade in list(recent_trades)[-self.window:]:
+                amount = trade['amount']
+                self._add_return(trade['profit'] / amount if amount else 0.0,
+                                 1 if trade['outcome'] == 'win' else 0)
+
+    def rolling_sharpe(self):
+        """Mean over standard deviation of per-trade returns in the window"""
+        n = len(self._returns)
+        if n < 2:
+            return 0.0
+        mean = self._return_sum / n
+        variance = max(self._return_sq_sum / n - mean * mean, 0.0) * n / (n - 1)
+        return mean / math.sqrt(variance) if variance > 0 else 0.0
+
+    def get_stats(self):
+        """Snapshot of all metrics as plain, JSON-serializable types"""
+        with self._lock:
+            n = len(self._returns)
+            return {
+                'total_trades': self.total_trades,
+                'win_rate': (self.wins / self.total_trades) * 100 if self.total_trades else 0,
+                'total_profit': self.total_profit,
+                'rolling_trades': n,
+                'rolling_win_rate': (self._rolling_wins / n) * 100 if n else 0,
+                'rolling_sharpe': self.rolling_sharpe(),
+                'max_drawdown': self.max_drawdown,
+                'current_drawdown': self.peak_balance - self.balance,
+                'by_asset': {k: v.to_dict() for k, v in self.by_asset.items()},
+                'by_hour': {k: v.to_dict() for k, v in sorted(self.by_hour.items())},
+                'calibration': {k: v.to_dict() for k, v in sorted(self.by_confidence.items())}
+            }
+
+class StatsServer:
+    """Serve PerformanceAnalytics.get_stats() (and memory telemetry) as JSON on a local HTTP port"""
+    def __init__(self, analytics, memory_monitor=None, host=None, port=None):
+        self.analytics = analytics
+        self.memory_monitor = memory_monitor
+        self.host = host or Config.STATS_HOST
+        self.port = port if port is not None else Config.STATS_PORT
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        analytics = self.analytics
+        memory_monitor = self.memory_monitor
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip('/') not in ('', '/stats'):
+                    self.send_error(404)
+                    return
+                stats = analytics.get_stats()
+                if memory_monitor is not None:
+                    stats['memory'] = memory_monitor.get_stats()
+                body = json.dumps(stats, default=str).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug("Stats request: " + format, *args)
+
+        try:
+            self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        except OSError as e:
+            logger.error(f"Failed to start stats server on {self.host}:{self.port}: {e}")
+            return False
+        self.port = self._server.server_port  # The assigned port when bound to port 0
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stats-server", daemon=True)
+        self._thread.start()
+        logger.info(f"Stats server listening on http://{self.host}:{self.port}/stats")
+        return True
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
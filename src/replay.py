@@ -0,0 +1,143 @@
+import sys
+import time
+import bisect
+import logging
+import argparse
+import pandas as pd
+from collections import defaultdict
+from config.settings import Config
+
+logger = logging.getLogger(__name__)
+
+class ReplayClient:
+    """Stands in for PocketOptionClient when replaying a recorded tick stream
+
+    Orders are settled against the recording itself: a call wins if the
+    first recorded price at or after expiry is above the entry price.
+    """
+    def __init__(self, ticks, payout=0.92, order_latency=0.0):
+        self.ticks = ticks
+        self.payout = payout
+        self.order_latency = order_latency
+        self.connected = False
+        self.current = None
+
+        # Per-asset timestamps and prices for settling orders
+        self._times = defaultdict(list)
+        self._prices = defaultdict(list)
+        for tick in ticks.itertuples(index=False):
+            self._times[tick.asset].append(tick.timestamp)
+            self._prices[tick.asset].append(tick.price)
+
+    def connect(self):
+        self.connected = True
+        return True
+
+    def disconnect(self):
+        self.connected = False
+
+    def get_balance(self):
+        return Config.INITIAL_BALANCE
+
+    def feed(self, tick):
+        """Make a recorded tick the current one and return it as tick_data"""
+        self.current = {
+            'asset': tick.asset,
+            'price': tick.price,
+            'timestamp': tick.timestamp.to_pydatetime(),
+            'received_ns': time.monotonic_ns(),
+            'volume': tick.volume
+        }
+        return self.current
+
+    def get_current_price(self, asset):
+        return self.current
+
+    def place_trade(self, asset, amount, direction, expiry, trace_id=None):
+        if self.order_latency:
+            time.sleep(self.order_latency)
+
+        entry_time = self.current['timestamp']
+        times = self._times[asset]
+        i = bisect.bisect_left(times, pd.Timestamp(entry_time) + pd.Timedelta(seconds=expiry))
+        if i >= len(times):
+            return {'success': False, 'error': 'No price at expiry', 'outcome': 'error'}
+
+        exit_price = self._prices[asset][i]
+        up = exit_price > self.current['price']
+        win = up if direction == "call" else not up
+        return {
+            'success': True,
+            'outcome': "win" if win else "loss",
+            'payout': amount * self.payout if win else -amount,
+            'balance': Config.INITIAL_BALANCE
+        }
+
+def load_recording(path):
+    """Load a tick recording (CSV with timestamp, asset, price, volume)"""
+    ticks = pd.read_csv(path, parse_dates=['timestamp'])
+    if 'volume' not in ticks:
+        ticks['volume'] = 0
+    return ticks.sort_values('timestamp', kind='stable').reset_index(drop=True)
+
+def record_stream(client, n_ticks, path, interval=1.0, start=None):
+    """Record n_ticks rounds of prices for every asset from a client to CSV
+
+    Timestamps are spaced interval seconds apart from start (default now),
+    so a simulated client can produce a recording without waiting.
+    """
+    start = pd.Timestamp(start or pd.Timestamp.now())
+    rows = []
+    for i in range(n_ticks):
+        timestamp = start + pd.Timedelta(seconds=i * interval)
+        for asset in Config.ASSETS:
+            tick = client.get_current_price(asset)
+            if tick is not None:
+                rows.append({'timestamp': timestamp, 'asset': asset,
+                             'price': tick['price'], 'volume': tick.get('volume', 0)})
+    pd.DataFrame(rows).to_csv(path, index=False)
+    return len(rows)
+
+def run_replay(ticks, model_path=None, order_latency=0.0):
+    """Push a recorded stream through the OTCTradingBot pipeline as fast as possible
+
+    Returns the bot (for its tracer, risk manager and model) and the
+    wall-clock seconds the replay took.
+    """
+    from src.main import OTCTradingBot
+
+    client = ReplayClient(ticks, order_latency=order_latency)
+    bot = OTCTradingBot(demo_mode=True, client=client, use_journal=False, record_training_data=False)
+    bot.telegram_bot.enabled = False
+    if model_path:
+        bot.model.load_model(model_path)
+    client.connect()
+
+    started = time.perf_counter()
+    for tick in ticks.itertuples(index=False):
+        tick_data = client.feed(tick)
+        bot.current_asset = tick.asset
+        features = bot.data_manager.add_tick(tick_data)
+        bot.process_market_data(tick_data, features)
+    elapsed = time.perf_counter() - started
+    return bot, elapsed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded tick stream and report pipeline latency")
+    parser.add_argument('recording', help="CSV with timestamp, asset, price, volume columns")
+    parser.add_argument('--model', help="Model file to load (default: untrained model)")
+    parser.add_argument('--order-latency', type=float, default=0.0,
+                        help="Simulated order round-trip in seconds")
+    args = parser.parse_args(argv)
+
+    ticks = load_recording(args.recording)
+    bot, elapsed = run_replay(ticks, args.model, args.order_latency)
+
+    span = (ticks['timestamp'].iloc[-1] - ticks['timestamp'].iloc[0]).total_seconds() if len(ticks) else 0
+    print(f"Replayed {len(ticks)} ticks ({span:.0f}s of market time) in {elapsed:.2f}s "
+          f"({span / elapsed if elapsed else 0:.0f}x real time), {bot.trade_count} trades")
+    print(bot.tracer.format_report())
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
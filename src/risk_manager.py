@@ -1,118 +1,268 @@
+import os
+import csv
+import numpy as np
 import pandas as pd
+from collections import deque
 from datetime import datetime, time
 import logging
 from config.settings import Config
+from src.market_clock import MarketClock
+from src.performance_analytics import PerformanceAnalytics
 
 logger = logging.getLogger(__name__)
 
 class RiskManager:
-    def __init__(self):
+    def __init__(self, clock=None, journal=None):
+        self.clock = clock or MarketClock()
+        self.journal = journal
         self.balance = Config.INITIAL_BALANCE
         self.initial_balance = Config.INITIAL_BALANCE
-        self.trades = []
+        self.trades = deque(maxlen=Config.MAX_TRADES_IN_MEMORY)  # Older trades live in the journal or spill file
         self.consecutive_losses = 0
         self.daily_profit = 0
         self.last_trade_time = None
         self.daily_trades = 0
         self.max_daily_trades = 50  # Limit daily trades to prevent over-trading
+        self.analytics = PerformanceAnalytics(self.initial_balance)
+        self.pending_spill = []  # Evicted trades not yet written to TRADE_SPILL_PATH
+        self.open_positions = {}
+        self.total_open_positions = 0
+        self.blocked_reason = None
+        self._gates_generation = None
+        self.trading_date = None
         
-    def can_trade(self, prediction_confidence):
-        """Check if we're allowed to trade based on risk rules"""
-        current_time = datetime.now()
+        if self.journal is not None:
+            self.restore()
+            
+    def restore(self):
+        """Restore balance, daily counters and trade history from the journal"""
+        state, trades = self.journal.recover()
+        if state is None:
+            return False
+            
+        self.balance = state['balance']
+        self.daily_profit = state['daily_profit']
+        self.daily_trades = state['daily_trades']
+        self.consecutive_losses = state['consecutive_losses']
+        self.last_trade_time = state['last_trade_time']
+        self.trading_date = self.last_trade_time.date()
+        self.trades.extend(trades)
+        self.analytics.restore(
+            self.journal.aggregate_stats(self.initial_balance, self.analytics.bucket_width), trades
+        )
+        logger.info(f"Restored {self.analytics.total_trades} trades from journal "
+                    f"({len(trades)} kept in memory). Balance: ${self.balance:.2f}")
+        self._update_gates()
+        return True
+        
+    def _check_boundaries(self):
+        """Re-evaluate gates when the clock has moved into a new minute"""
+        if self.clock.now is None:
+            self.clock.update()
+        if self.clock.generation == self._gates_generation:
+            return
+            
+        self._gates_generation = self.clock.generation
+        # If it's a new day, reset daily counters
+        new_day = self.trading_date is not None and self.trading_date != self.clock.date
+        self.trading_date = self.clock.date
+        if new_day:
+            self.daily_profit = 0
+            self.daily_trades = 0
+            self.consecutive_losses = 0
+            logger.info("New trading day started. Reset daily counters.")
+            self._update_gates()
+            
+    def _update_gates(self):
+        """Recompute the cached account-level gate (after a trade or day change)
         
-        # Check if we've exceeded daily loss limit
+        Warns once when trading becomes blocked instead of on every check.
+        """
+        reason = None
         if self.daily_profit <= -Config.MAX_DAILY_LOSS:
-            logger.warning("Daily loss limit exceeded. Stopping trading for today.")
-            return False
+            reason = "Daily loss limit exceeded. Stopping trading for today."
+        elif self.balance <= self.initial_balance - Config.MAX_DRAWDOWN:
+            reason = "Maximum drawdown exceeded. Stopping trading."
+        elif self.consecutive_losses >= Config.STOP_LOSS_STREAK:
+            reason = "Too many consecutive losses. Taking a break."
+        elif self.daily_trades >= self.max_daily_trades:
+            reason = "Daily trade limit exceeded."
             
-        # Check if we've exceeded maximum drawdown
-        if self.balance <= self.initial_balance - Config.MAX_DRAWDOWN:
-            logger.warning("Maximum drawdown exceeded. Stopping trading.")
-            return False
+        if reason != self.blocked_reason:
+            if reason:
+                logger.warning(reason)
+            else:
+                logger.info("Risk limits cleared. Trading allowed.")
+            self.blocked_reason = reason
             
-        # Check if we've hit too many consecutive losses
-        if self.consecutive_losses >= Config.STOP_LOSS_STREAK:
-            logger.warning("Too many consecutive losses. Taking a break.")
+    def _has_capacity(self, asset):
+        """Check the concurrent open position limits"""
+        if self.total_open_positions >= Config.MAX_OPEN_POSITIONS:
+            return False
+        return self.open_positions.get(asset, 0) < Config.MAX_OPEN_POSITIONS_PER_ASSET
+        
+    def can_trade(self, prediction_confidence, asset=None):
+        """Check if we're allowed to trade based on risk rules"""
+        self._check_boundaries()
+        
+        # Daily loss, drawdown, losing streak and daily trade limits
+        if self.blocked_reason is not None:
             return False
             
-        # Check confidence threshold
-        if prediction_confidence < Config.CONFIDENCE_THRESHOLD:
+        # Check confidence threshold (written so a NaN confidence fails it too)
+        if not prediction_confidence >= Config.CONFIDENCE_THRESHOLD:
             return False
             
-        # Check if we've exceeded daily trade limit
-        if self.daily_trades >= self.max_daily_trades:
-            logger.warning("Daily trade limit exceeded.")
+        # Check exposure limits
+        if not self._has_capacity(asset):
             return False
             
         # Check trading hours
-        current_time_obj = current_time.time()
-        if not (Config.TRADING_HOURS["start"] <= current_time_obj <= Config.TRADING_HOURS["end"]):
-            logger.warning("Outside trading hours.")
-            return False
+        return self.clock.is_trading_hours(asset)
+        
+    def can_trade_batch(self, confidences, assets):
+        """Evaluate candidate signals for many assets in one call
+        
+        Returns a boolean mask; when limits leave room for fewer trades than
+        there are candidates, the most confident ones are kept.
+        """
+        confidences = np.asarray(confidences, dtype=float)
+        allowed = np.zeros(len(confidences), dtype=bool)
+        self._check_boundaries()
+        if self.blocked_reason is not None or len(confidences) == 0:
+            return allowed
             
-        # If it's a new day, reset daily counters
-        if self.last_trade_time and self.last_trade_time.date() != current_time.date():
-            self.daily_profit = 0
-            self.daily_trades = 0
-            self.consecutive_losses = 0
-            logger.info("New trading day started. Reset daily counters.")
+        session_open = np.fromiter((self.clock.is_trading_hours(a) for a in assets), dtype=bool, count=len(assets))
+        asset_open = np.fromiter((self.open_positions.get(a, 0) for a in assets), dtype=int, count=len(assets))
+        candidates = np.flatnonzero(
+            (confidences >= Config.CONFIDENCE_THRESHOLD)  # False for NaN
+            & session_open
+            & (asset_open < Config.MAX_OPEN_POSITIONS_PER_ASSET)
+        )
+        
+        budget = min(self.max_daily_trades - self.daily_trades,
+                     Config.MAX_OPEN_POSITIONS - self.total_open_positions)
+        if budget <= 0 or len(candidates) == 0:
+            return allowed
             
-        return True
+        # Greedily keep the most confident candidates within the per-asset limit
+        taken = {}
+        for i in candidates[np.argsort(-confidences[candidates], kind='stable')]:
+            asset = assets[i]
+            if asset_open[i] + taken.get(asset, 0) >= Config.MAX_OPEN_POSITIONS_PER_ASSET:
+                continue
+            taken[asset] = taken.get(asset, 0) + 1
+            allowed[i] = True
+            budget -= 1
+            if budget == 0:
+                break
+        return allowed
+        
+    def open_position(self, asset):
+        """Register an order that has been sent and not yet settled"""
+        self.open_positions[asset] = self.open_positions.get(asset, 0) + 1
+        self.total_open_positions += 1
+        
+    def close_position(self, asset):
+        """Release an open position (settled, rejected or failed)"""
+        if self.open_positions.get(asset, 0) > 0:
+            self.open_positions[asset] -= 1
+            self.total_open_positions -= 1
     
-    def record_trade(self, amount, outcome, profit):
-        """Record trade results and update balances"""
+    def record_trade(self, amount, outcome, profit, asset=None, confidence=None, trace_id=None,
+                     tick_price=None, staleness_ms=None):
+        """Record trade results and update balances
+        
+        tick_price is the price the signal was computed on and staleness_ms
+        how old that tick was when the order was submitted.
+        """
         self.balance += profit
         self.daily_profit += profit
         self.daily_trades += 1
         
+        trade_time = self.clock.now or datetime.now()
         trade_record = {
-            'time': datetime.now(),
+            'time': trade_time,
             'amount': amount,
             'outcome': outcome,
             'profit': profit,
             'balance': self.balance,
             'daily_profit': self.daily_profit,
-            'daily_trades': self.daily_trades
+            'daily_trades': self.daily_trades,
+            'asset': asset,
+            'confidence': confidence,
+            'trace_id': trace_id,
+            'tick_price': tick_price,
+            'staleness_ms': staleness_ms
         }
         
-        self.trades.append(trade_record)
-        self.last_trade_time = datetime.now()
-        
         if outcome == 'win':
             self.consecutive_losses = 0
         else:
             self.consecutive_losses += 1
+        trade_record['consecutive_losses'] = self.consecutive_losses
+        
+        if self.journal is None and len(self.trades) == self.trades.maxlen:
+            self.pending_spill.append(self.trades[0])
+            if len(self.pending_spill) >= Config.TRADE_SPILL_BATCH_SIZE:
+                self.flush_spill()
+        self.trades.append(trade_record)
+        self.last_trade_time = trade_time
+        self.analytics.record(trade_record)
+        self.close_position(asset)
+        self._update_gates()
+        
+        if self.journal is not None:
+            self.journal.append(trade_record)
             
-        logger.info(f"Trade recorded: {outcome}, Profit: ${profit:.2f}, Balance: ${self.balance:.2f}")
+        logger.info("Trade recorded: %s, Profit: $%.2f, Balance: $%.2f", outcome, profit, self.balance,
+                    extra={'event': 'trade_recorded'})
         return trade_record
         
+    def flush_spill(self):
+        """Append the trades evicted from memory to the spill file in one write (used without a journal)"""
+        if not self.pending_spill:
+            return 0
+            
+        path = Config.TRADE_SPILL_PATH
+        is_new = not os.path.exists(path)
+        if is_new and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            with open(path, 'a', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=list(self.pending_spill[0]), extrasaction='ignore')
+                if is_new:
+                    writer.writeheader()
+                writer.writerows(self.pending_spill)
+        except Exception as e:
+            logger.error(f"Error writing trade spill file: {e}")
+            return 0
+        written = len(self.pending_spill)
+        self.pending_spill = []
+        return written
+        
     def get_performance_stats(self):
         """Calculate performance statistics"""
-        if not self.trades:
-            return {
-                'total_trades': 0,
-                'winning_trades': 0,
-                'win_rate': 0,
-                'total_profit': 0,
-                'profit_percentage': 0,
-                'consecutive_losses': self.consecutive_losses,
-                'daily_profit': self.daily_profit,
-                'daily_trades': self.daily_trades
-            }
-            
-        wins = [t for t in self.trades if t['outcome'] == 'win']
+        analytics = self.analytics.get_stats()
         total_profit = self.balance - self.initial_balance
         profit_percentage = (total_profit / self.initial_balance) * 100
         
         return {
-            'total_trades': len(self.trades),
-            'winning_trades': len(wins),
-            'win_rate': (len(wins) / len(self.trades)) * 100 if self.trades else 0,
+            'total_trades': analytics['total_trades'],
+            'winning_trades': self.analytics.wins,
+            'win_rate': analytics['win_rate'],
             'total_profit': total_profit,
             'profit_percentage': profit_percentage,
             'consecutive_losses': self.consecutive_losses,
             'daily_profit': self.daily_profit,
-            'daily_trades': self.daily_trades
+            'daily_trades': self.daily_trades,
+            'rolling_win_rate': analytics['rolling_win_rate'],
+            'rolling_sharpe': analytics['rolling_sharpe'],
+            'max_drawdown': analytics['max_drawdown'],
+            'current_drawdown': analytics['current_drawdown'],
+            'by_asset': analytics['by_asset'],
+            'by_hour': analytics['by_hour'],
+            'calibration': analytics['calibration']
         }
         
     def get_daily_trades(self, date=None):
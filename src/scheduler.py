@@ -0,0 +1,111 @@
+import heapq
+import itertools
+import threading
+import time
+import logging
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+class Job:
+    """A scheduled callable with its next due time on the monotonic clock"""
+    def __init__(self, func, name, interval=None, at=None):
+        self.func = func
+        self.name = name
+        self.interval = interval
+        self.at = at
+        self.due = None
+        self.last_target = None  # Wall-clock target of the last daily run
+        self.runs = 0
+
+class Scheduler:
+    """Timer-heap scheduler built on a monotonic clock
+
+    Interval jobs run at a fixed rate (missed runs are skipped, never
+    replayed back to back). Daily jobs are pinned to a wall-clock time and
+    fire once per calendar day. A job may return a number of seconds to
+    override its next delay, e.g. to sleep until a session opens.
+
+    monotonic and wall_clock replace time.monotonic and datetime.now, so
+    tests can drive the scheduler with a fake clock.
+    """
+    def __init__(self, on_error=None, error_delay=5, monotonic=None, wall_clock=None):
+        self.on_error = on_error
+        self.error_delay = error_delay
+        self.monotonic = monotonic or time.monotonic
+        self.wall_clock = wall_clock or datetime.now
+        self._heap = []
+        self._counter = itertools.count()
+        self._stop_event = threading.Event()
+
+    def every(self, interval, func, name=None, delay=0):
+        """Run func every interval seconds, first after delay seconds"""
+        job = Job(func, name or func.__name__, interval=interval)
+        self._push(job, self.monotonic() + delay)
+        return job
+
+    def daily(self, at, func, name=None):
+        """Run func once a day at the wall-clock time at (datetime.time)"""
+        job = Job(func, name or func.__name__, at=at)
+        self._push(job, self._next_daily_due(job))
+        return job
+
+    def _push(self, job, due):
+        job.due = due
+        heapq.heappush(self._heap, (due, next(self._counter), job))
+
+    def _next_daily_due(self, job):
+        """Monotonic due time of the next daily run strictly after the last one"""
+        now = self.wall_clock()
+        target = datetime.combine(now.date(), job.at)
+        floor = max(now, job.last_target) if job.last_target else now
+        while target <= floor:
+            target += timedelta(days=1)
+        job.last_target = target
+        return self.monotonic() + (target - now).total_seconds()
+
+    def _reschedule(self, job, result, now):
+        if isinstance(result, (int, float)) and not isinstance(result, bool):
+            self._push(job, now + max(result, 0))
+        elif job.interval is not None:
+            # Fixed rate: keep the original cadence, skip runs we fell behind on
+            due = job.due + job.interval
+            if due <= now:
+                missed = int((now - job.due) // job.interval)
+                due = job.due + job.interval * (missed + 1)
+            self._push(job, due)
+        else:
+            self._push(job, self._next_daily_due(job))
+
+    def run_pending(self):
+        """Run every job that is due and return seconds until the next one"""
+        now = self.monotonic()
+        while self._heap and self._heap[0][0] <= now:
+            _, _, job = heapq.heappop(self._heap)
+            try:
+                result = job.func()
+                job.runs += 1
+            except Exception as e:
+                logger.error(f"Error in scheduled job {job.name}: {e}")
+                if self.on_error:
+                    self.on_error(job, e)
+                result = self.error_delay if job.interval is not None else None
+            now = self.monotonic()
+            self._reschedule(job, result, now)
+
+        if not self._heap:
+            return None
+        return max(self._heap[0][0] - self.monotonic(), 0)
+
+    def run(self):
+        """Run jobs until stop() is called, sleeping until the next is due"""
+        self._stop_event.clear()
+        while not self._stop_event.is_set():
+            delay = self.run_pending()
+            if delay is None:
+                break
+            self._stop_event.wait(delay)
+
+    def stop(self):
+        """Stop run() and wake it if it is sleeping"""
+        self._stop_event.set()
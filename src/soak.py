@@ -0,0 +1,93 @@
+import os
+import sys
+import argparse
+import logging
+import tempfile
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+from config.settings import Config
+from src.data_manager import FEATURE_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+def run_soak(days=7, tick_interval=10, sample_every=1000, warmup_fraction=0.1, max_growth_mb=None,
+             max_trades_in_memory=50, seed=0):
+    """Drive a simulated period of ticks through the bot and check memory stays flat
+
+    Ticks are generated by the simulated PocketOptionClient with simulated
+    timestamps, so a week runs in minutes. The in-memory trade window is
+    shrunk to max_trades_in_memory so trade eviction and spilling are
+    exercised too; the spill file lives in a temporary directory. The
+    simulated prices and outcomes are seeded, so runs are repeatable. Returns
+    (passed, growth_mb, monitor, spilled_trades); growth is measured from
+    the end of warmup to the last sample.
+    """
+    from src.main import OTCTradingBot
+    from src.api_client import PocketOptionClient
+
+    max_growth_mb = max_growth_mb if max_growth_mb is not None else Config.SOAK_MAX_GROWTH_MB
+    saved = Config.MAX_TRADES_IN_MEMORY, Config.TRADE_SPILL_PATH
+
+    with tempfile.TemporaryDirectory(prefix='soak_') as spill_dir:
+        Config.MAX_TRADES_IN_MEMORY = max_trades_in_memory
+        Config.TRADE_SPILL_PATH = os.path.join(spill_dir, 'trades_spill.csv')
+        try:
+            np.random.seed(seed)  # The simulated client draws from the global generator
+            client = PocketOptionClient(demo_mode=True)
+            client.order_delay = 0
+            client.connected = True
+            bot = OTCTradingBot(demo_mode=True, client=client, use_journal=False,
+                                record_training_data=False)
+            bot.telegram_bot.enabled = False
+
+            # Give the model a signal to act on so the trade path is exercised too
+            rng = np.random.default_rng(seed)
+            X = pd.DataFrame(rng.normal(size=(500, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS)
+            bot.model.train(X, pd.Series((X['velocity'] > 0).astype(int)))
+
+            n_ticks = int(days * 86400 / tick_interval)
+            warmup_ticks = int(n_ticks * warmup_fraction)
+            start = datetime.combine(datetime.now().date(), Config.TRADING_HOURS["start"])
+            baseline = None
+
+            for i in range(n_ticks):
+                asset = Config.ASSETS[i % len(Config.ASSETS)]
+                tick_data = client.get_current_price(asset)
+                tick_data['timestamp'] = start + timedelta(seconds=i * tick_interval)
+                bot.current_asset = asset
+                features = bot.data_manager.add_tick(tick_data)
+                bot.process_market_data(tick_data, features)
+
+                if i % sample_every == 0 or i == n_ticks - 1:
+                    sample = bot.memory_monitor.sample()
+                    if baseline is None and i >= warmup_ticks:
+                        baseline = sample['rss_mb']
+
+            bot.risk_manager.flush_spill()
+            spilled = 0
+            if os.path.exists(Config.TRADE_SPILL_PATH):
+                with open(Config.TRADE_SPILL_PATH) as f:
+                    spilled = sum(1 for _ in f) - 1
+            logger.info(f"Soak made {bot.trade_count} trades; {spilled} were spilled from memory")
+        finally:
+            Config.MAX_TRADES_IN_MEMORY, Config.TRADE_SPILL_PATH = saved
+
+    growth = bot.memory_monitor.samples[-1]['rss_mb'] - (baseline or bot.memory_monitor.samples[0]['rss_mb'])
+    return growth <= max_growth_mb, growth, bot.memory_monitor, spilled
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Soak test: check memory stays flat over a simulated run")
+    parser.add_argument('--days', type=float, default=7)
+    parser.add_argument('--tick-interval', type=float, default=10, help="Simulated seconds between ticks")
+    parser.add_argument('--max-growth-mb', type=float, default=None)
+    args = parser.parse_args(argv)
+
+    passed, growth, monitor, spilled = run_soak(args.days, args.tick_interval, max_growth_mb=args.max_growth_mb)
+    print(f"RSS history (MB): {monitor.get_stats()['rss_mb_history']}")
+    print(f"Trades spilled from memory: {spilled}")
+    print(f"RSS growth after warmup: {growth:.1f} MB -> {'PASS' if passed else 'FAIL'}")
+    return 0 if passed else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
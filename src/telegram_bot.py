@@ -31,7 +31,7 @@ class TelegramBot:
         try:
             response = requests.post(url, data=payload, timeout=10)
             if response.status_code == 200:
-                logger.info("Telegram message sent successfully")
+                logger.debug("Telegram message sent successfully")
                 return True
             else:
                 logger.error(f"Telegram API error: {response.status_code} - {response.text}")
@@ -93,6 +93,9 @@ class TelegramBot:
 <b>Win Rate:</b> {report_data['win_rate']:.1f}%
 <b>Total Profit:</b> ${report_data['total_profit']:.2f}
 <b>Ending Balance:</b> ${report_data['ending_balance']:.2f}
+<b>Rolling Win Rate:</b> {report_data.get('rolling_win_rate', 0):.1f}%
+<b>Rolling Sharpe:</b> {report_data.get('rolling_sharpe', 0):.2f}
+<b>Max Drawdown:</b> ${report_data.get('max_drawdown', 0):.2f}
 
 #DailyReport #TradingBot
         """
@@ -0,0 +1,227 @@
+import os
+import queue
+import sqlite3
+import threading
+import logging
+from datetime import datetime
+from config.settings import Config
+
+logger = logging.getLogger(__name__)
+
+TRADE_FIELDS = ['time', 'amount', 'outcome', 'profit', 'balance',
+                'daily_profit', 'daily_trades', 'consecutive_losses', 'asset', 'confidence',
+                'trace_id', 'tick_price', 'staleness_ms']
+# Columns added after the first release, with their SQLite types
+ADDED_COLUMNS = {'asset': 'TEXT', 'confidence': 'REAL', 'trace_id': 'INTEGER',
+                 'tick_price': 'REAL', 'staleness_ms': 'REAL'}
+STATE_FIELDS = ['balance', 'daily_profit', 'daily_trades', 'consecutive_losses', 'last_trade_time']
+
+class TradeJournal:
+    """Append-only SQLite (WAL) journal of trades with snapshot + replay recovery
+
+    append() only enqueues the record; a writer thread inserts records in
+    batches and commits once per batch or flush interval, so the trade path
+    never waits on disk. With synchronous=FULL every commit is fsynced, so
+    a committed batch survives power loss as well as a crash. A state
+    snapshot is written every JOURNAL_SNAPSHOT_EVERY trades to bound the
+    replay on startup.
+    """
+    def __init__(self, path=None, batch_size=None, flush_interval=None, snapshot_every=None):
+        self.path = path or Config.JOURNAL_PATH
+        self.batch_size = batch_size or Config.JOURNAL_BATCH_SIZE
+        self.flush_interval = flush_interval or Config.JOURNAL_FLUSH_INTERVAL
+        self.snapshot_every = snapshot_every or Config.JOURNAL_SNAPSHOT_EVERY
+        self._queue = queue.Queue()
+        self._writer = None
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS trades (id INTEGER PRIMARY KEY, time TEXT, amount REAL, "
+                "outcome TEXT, profit REAL, balance REAL, daily_profit REAL, daily_trades INTEGER, "
+                "consecutive_losses INTEGER, asset TEXT, confidence REAL, trace_id INTEGER, "
+                "tick_price REAL, staleness_ms REAL)"
+            )
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(trades)")}
+            for column, column_type in ADDED_COLUMNS.items():
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE trades ADD COLUMN {column} {column_type}")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS snapshots (trade_id INTEGER PRIMARY KEY, balance REAL, "
+                "daily_profit REAL, daily_trades INTEGER, consecutive_losses INTEGER, last_trade_time TEXT)"
+            )
+        conn.close()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA synchronous=FULL")
+        return conn
+
+    def start(self):
+        """Start the background writer thread"""
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_loop, name="trade-journal", daemon=True)
+            self._writer.start()
+
+    def append(self, trade_record):
+        """Queue a trade record for writing (non-blocking)"""
+        if self._writer is None:
+            self.start()
+        self._queue.put_nowait(trade_record)
+
+    def close(self):
+        """Flush pending records and stop the writer thread"""
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+
+    def _write_loop(self):
+        conn = self._connect()
+        with conn:
+            trades_since_snapshot = conn.execute(
+                "SELECT COUNT(*) FROM trades WHERE id > COALESCE((SELECT MAX(trade_id) FROM snapshots), 0)"
+            ).fetchone()[0]
+
+        running = True
+        while running:
+            batch = []
+            try:
+                record = self._queue.get(timeout=self.flush_interval)
+                while True:
+                    if record is None:
+                        running = False
+                        break
+                    batch.append(record)
+                    if len(batch) >= self.batch_size:
+                        break
+                    record = self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            if not batch:
+                continue
+
+            try:
+                with conn:
+                    for record in batch:
+                        cursor = conn.execute(
+                            f"INSERT INTO trades ({', '.join(TRADE_FIELDS)}) "
+                            f"VALUES ({', '.join('?' * len(TRADE_FIELDS))})",
+                            [record['time'].isoformat()] + [record.get(f) for f in TRADE_FIELDS[1:]]
+                        )
+                        trades_since_snapshot += 1
+                        if trades_since_snapshot >= self.snapshot_every:
+                            conn.execute(
+                                "INSERT INTO snapshots VALUES (?, ?, ?, ?, ?, ?)",
+                                (cursor.lastrowid, record['balance'], record['daily_profit'],
+                                 record['daily_trades'], record['consecutive_losses'],
+                                 record['time'].isoformat())
+                            )
+                            trades_since_snapshot = 0
+            except Exception as e:
+                logger.error(f"Error writing trade journal: {e}")
+        conn.close()
+
+    def aggregate_stats(self, initial_balance=None, bucket_width=None):
+        """Lifetime analytics counters over every journaled trade, computed in SQL
+
+        Feeds PerformanceAnalytics.restore so totals, drawdown and the
+        per-asset / hour / confidence tables survive a restart even though
+        only a bounded tail of trades is loaded back into memory.
+        """
+        initial_balance = initial_balance if initial_balance is not None else Config.INITIAL_BALANCE
+        bucket_width = bucket_width or Config.CONFIDENCE_BUCKET_WIDTH
+        counters = "COUNT(*), SUM(outcome = 'win'), SUM(profit), SUM(COALESCE(confidence, 0))"
+        conn = self._connect()
+        try:
+            trades, wins, profit, peak = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(outcome = 'win'), 0), COALESCE(SUM(profit), 0), MAX(balance) "
+                "FROM trades"
+            ).fetchone()
+            last = conn.execute("SELECT balance FROM trades ORDER BY id DESC LIMIT 1").fetchone()
+            max_drawdown = conn.execute(
+                "SELECT COALESCE(MAX(MAX(peak, ?) - balance), 0) FROM "
+                "(SELECT balance, MAX(balance) OVER (ORDER BY id) AS peak FROM trades)",
+                (initial_balance,)
+            ).fetchone()[0]
+            by_asset = conn.execute(
+                f"SELECT COALESCE(asset, 'UNKNOWN'), {counters} FROM trades GROUP BY 1"
+            ).fetchall()
+            # time is stored in ISO format, so characters 12-13 are the hour
+            by_hour = conn.execute(
+                f"SELECT CAST(substr(time, 12, 2) AS INTEGER), {counters} FROM trades GROUP BY 1"
+            ).fetchall()
+            by_confidence = conn.execute(
+                f"SELECT CAST(confidence / ? AS INTEGER), {counters} FROM trades "
+                "WHERE confidence IS NOT NULL GROUP BY 1",
+                (bucket_width,)
+            ).fetchall()
+        finally:
+            conn.close()
+
+        return {
+            'trades': trades,
+            'wins': wins,
+            'profit': profit,
+            'balance': last[0] if last else initial_balance,
+            'peak_balance': peak if peak is not None else initial_balance,
+            'max_drawdown': max_drawdown,
+            'by_asset': by_asset,
+            'by_hour': by_hour,
+            # Same bucket keys as PerformanceAnalytics.confidence_bucket
+            'by_confidence': [(round(bucket * bucket_width, 2),) + tuple(row) for bucket, *row in by_confidence]
+        }
+
+    def recover(self, history=None):
+        """Rebuild risk state and the recent trade history from the journal
+
+        Only the trades after the latest snapshot (to replay) and the last
+        history trades (MAX_TRADES_IN_MEMORY by default) are read. Returns
+        (state, trades); state is None if the journal is empty.
+        """
+        history = history or Config.MAX_TRADES_IN_MEMORY
+        conn = self._connect()
+        try:
+            snapshot = conn.execute(
+                "SELECT trade_id, balance, daily_profit, daily_trades, consecutive_losses, last_trade_time "
+                "FROM snapshots ORDER BY trade_id DESC LIMIT 1"
+            ).fetchone()
+            last_id = conn.execute("SELECT MAX(id) FROM trades").fetchone()[0]
+            if last_id is None:
+                return None, []
+            snapshot_id = snapshot[0] if snapshot else 0
+            rows = conn.execute(
+                f"SELECT id, {', '.join(TRADE_FIELDS)} FROM trades WHERE id > ? ORDER BY id",
+                (min(snapshot_id, last_id - history),)
+            ).fetchall()
+        finally:
+            conn.close()
+
+        trades = [dict(zip(TRADE_FIELDS, row[1:]), time=datetime.fromisoformat(row[1])) for row in rows]
+
+        # Start from the latest snapshot and replay the trades written after it
+        if snapshot:
+            state = dict(zip(STATE_FIELDS, snapshot[1:]))
+            state['last_trade_time'] = datetime.fromisoformat(state['last_trade_time'])
+        else:
+            state = {'balance': Config.INITIAL_BALANCE, 'daily_profit': 0, 'daily_trades': 0,
+                     'consecutive_losses': 0, 'last_trade_time': None}
+
+        for row, trade in zip(rows, trades):
+            if row[0] <= snapshot_id:
+                continue
+            if state['last_trade_time'] and state['last_trade_time'].date() != trade['time'].date():
+                # Same reset RiskManager.can_trade applies on a new day
+                state['daily_profit'] = 0
+                state['daily_trades'] = 0
+                state['consecutive_losses'] = 0
+            state['balance'] += trade['profit']
+            state['daily_profit'] += trade['profit']
+            state['daily_trades'] += 1
+            state['consecutive_losses'] = 0 if trade['outcome'] == 'win' else state['consecutive_losses'] + 1
+            state['last_trade_time'] = trade['time']
+
+        return state, trades[-history:]
@@ -1,24 +1,26 @@
 import numpy as np
-from sklearn.linear_model import SGDClassifier
-from sklearn.ensemble import RandomForestClassifier
+import pandas as pd
+from collections import deque
 from sklearn.preprocessing import StandardScaler
 import logging
 from config.settings import Config
+from src.calibration import PlattCalibrator
+from src.data_manager import FEATURE_COLUMNS
+from src.online_learning import OnlineEnsemble
 
 logger = logging.getLogger(__name__)
 
 class TradingModel:
     def __init__(self):
-        # Use online learning model for rapid adaptation
-        self.model = SGDClassifier(
-            loss='log_loss', 
-            learning_rate='optimal', 
-            eta0=0.1,
-            random_state=42
-        )
+        # Use an online ensemble (SGD + naive Bayes) for rapid adaptation
+        self.model = OnlineEnsemble()
         self.scaler = StandardScaler()
         self.is_trained = False
         self.training_samples = 0
+        # Maps the model's raw P(call wins) to a calibrated probability
+        self.calibrator = PlattCalibrator()
+        self.calibration_samples = deque(maxlen=Config.CALIBRATION_WINDOW)
+        self.updates_since_calibration = 0
         
     def train(self, features, labels):
         """Train the model on available data"""
@@ -53,6 +55,52 @@ class TradingModel:
             logger.error(f"Error training model: {e}")
             return False
     
+    def update(self, features, label, won=None):
+        """Incrementally learn from one labeled trade (O(features) per call)
+
+        label is 1 if a call would have won (see get_direction); won is
+        whether the trade itself won and feeds drift detection (defaults to
+        label). Returns True if concept drift was detected and the ensemble
+        was refit on recent trades.
+        """
+        try:
+            # Keep the column names so the scaler sees the same input as in predict
+            x = pd.DataFrame(np.asarray(features, dtype=float).reshape(1, -1), columns=FEATURE_COLUMNS)
+            self.scaler.partial_fit(x)
+            x_scaled = self.scaler.transform(x)
+            if self.is_trained:
+                # Score before learning so the calibration sees out-of-sample predictions
+                self.calibration_samples.append((self._raw_proba(x_scaled)[0], label))
+            
+            won = label if won is None else won
+            drift = self.model.learn_one(x_scaled[0], label, outcome_error=1 - won)
+            self.training_samples += 1
+            if self.training_samples >= Config.WARMUP_PERIOD:
+                self.is_trained = True
+            if drift:
+                # Predictions of the reset ensemble no longer match the old samples
+                self.calibration_samples.clear()
+            self.updates_since_calibration += 1
+            if self.updates_since_calibration >= Config.CALIBRATION_REFIT_EVERY:
+                self.recalibrate()
+            return drift
+        except Exception as e:
+            logger.error(f"Error updating model: {e}")
+            return False
+    
+    def recalibrate(self):
+        """Refit the calibration on recent out-of-sample predictions and their labels"""
+        self.updates_since_calibration = 0
+        if len(self.calibration_samples) < Config.CALIBRATION_MIN_SAMPLES:
+            return False
+        probabilities, labels = zip(*self.calibration_samples)
+        return self.calibrator.fit(probabilities, labels)
+        
+    def _raw_proba(self, features_scaled):
+        """Uncalibrated P(call wins) per row; non-finite outputs become 0.5"""
+        probabilities = self.model.predict_proba(features_scaled)[:, 1]
+        return np.where(np.isfinite(probabilities), probabilities, 0.5)
+        
     def predict(self, features):
         """Make a prediction based on current features"""
         if not self.is_trained:
@@ -62,12 +110,59 @@ class TradingModel:
             # Scale features
             features_scaled = self.scaler.transform(features)
             
-            # Predict probability of success
-            proba = self.model.predict_proba(features_scaled)
-            return proba[0][1]  # Return probability of class 1 (success)
+            # Calibrated probability of class 1 (success)
+            return float(self.calibrator.transform(self._raw_proba(features_scaled))[0])
         except Exception as e:
             logger.error(f"Error making prediction: {e}")
             return 0.5
+
+    def predict_batch(self, features, assets=None, top_k=None):
+        """Score many assets at once and rank the tradeable signals
+
+        Returns the calibrated P(call wins) for every row plus a list of
+        signals above Config.CONFIDENCE_THRESHOLD, best first.
+        """
+        if assets is None:
+            assets = list(features.index) if hasattr(features, 'index') else list(range(len(features)))
+        n_rows = len(features)
+        if n_rows == 0:
+            return np.empty(0), []
+
+        if not self.is_trained:
+            probabilities = np.full(n_rows, 0.5)
+        else:
+            try:
+                # One transform and one predict_proba for the whole matrix
+                features_scaled = self.scaler.transform(features)
+                probabilities = self.calibrator.transform(self._raw_proba(features_scaled))
+            except Exception as e:
+                logger.error(f"Error making batch prediction: {e}")
+                probabilities = np.full(n_rows, 0.5)
+
+        # Confidence is symmetric around 0.5 so puts can clear the threshold too
+        confidences = np.maximum(probabilities, 1 - probabilities)
+        candidates = np.flatnonzero(confidences >= Config.CONFIDENCE_THRESHOLD)
+
+        if top_k is not None and top_k < len(candidates):
+            top = np.argpartition(-confidences[candidates], top_k - 1)[:top_k]
+            candidates = candidates[top]
+        candidates = candidates[np.argsort(-confidences[candidates], kind='stable')]
+
+        signals = [{
+            'asset': assets[i],
+            'direction': "call" if probabilities[i] >= 0.5 else "put",
+            'confidence': float(confidences[i]),
+            'probability': float(probabilities[i])
+        } for i in candidates]
+
+        return probabilities, signals
+
+    @staticmethod
+    def get_direction(prediction):
+        """Map the probability that a call wins to a trade direction and its confidence"""
+        if prediction >= 0.5:
+            return "call", prediction
+        return "put", 1 - prediction
             
     def save_model(self, filepath):
         """Save model to file"""
@@ -77,7 +172,9 @@ class TradingModel:
                 'model': self.model,
                 'scaler': self.scaler,
                 'is_trained': self.is_trained,
-                'training_samples': self.training_samples
+                'training_samples': self.training_samples,
+                'calibrator': self.calibrator,
+                'calibration_samples': list(self.calibration_samples)
             }, filepath)
             logger.info(f"Model saved to {filepath}")
             return True
@@ -91,9 +188,17 @@ class TradingModel:
         try:
             data = joblib.load(filepath)
             self.model = data['model']
+            if not isinstance(self.model, OnlineEnsemble):
+                # Bare SGDClassifiers from older saves and pipeline exports keep
+                # voting, while a fresh ensemble learns online next to them
+                logger.info(f"Seeding online ensemble with loaded {type(self.model).__name__}")
+                self.model = OnlineEnsemble(seed=self.model)
             self.scaler = data['scaler']
             self.is_trained = data['is_trained']
             self.training_samples = data['training_samples']
+            # Older saves have no calibration
+            self.calibrator = data.get('calibrator') or PlattCalibrator()
+            self.calibration_samples = deque(data.get('calibration_samples', ()), maxlen=Config.CALIBRATION_WINDOW)
             logger.info(f"Model loaded from {filepath}. Training samples: {self.training_samples}")
             return True
         except Exception as e:
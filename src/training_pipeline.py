@@ -0,0 +1,182 @@
+import os
+import sys
+import time
+import argparse
+import logging
+import joblib
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import SGDClassifier
+from sklearn.naive_bayes import GaussianNB
+from sklearn.metrics import accuracy_score, log_loss
+from sklearn.model_selection import ParameterGrid, TimeSeriesSplit
+from sklearn.preprocessing import StandardScaler
+from config.settings import Config
+from src.calibration import PlattCalibrator
+from src.data_manager import FEATURE_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+# Model families and the hyperparameters searched for each
+MODEL_GRID = {
+    'sgd': (
+        SGDClassifier(loss='log_loss', random_state=42),
+        [
+            {'alpha': [1e-5, 1e-4, 1e-3], 'learning_rate': ['optimal']},
+            {'alpha': [1e-5, 1e-4, 1e-3], 'learning_rate': ['adaptive'], 'eta0': [0.01, 0.1]}
+        ]
+    ),
+    'random_forest': (
+        RandomForestClassifier(random_state=42, n_jobs=1),
+        # Each tree sees a quarter of the rows to keep nightly runs on millions of rows short
+        {'n_estimators': [100, 300], 'max_depth': [6, 12, None], 'min_samples_leaf': [1, 20],
+         'max_samples': [0.25]}
+    ),
+    'naive_bayes': (
+        GaussianNB(),
+        {'var_smoothing': [1e-9, 1e-7]}
+    ),
+}
+
+def load_training_data(path):
+    """Load recorded features and labels (CSV or Parquet) in time order"""
+    if path.endswith('.parquet'):
+        data = pd.read_parquet(path)
+    else:
+        data = pd.read_csv(path)
+    if 'timestamp' in data:
+        data = data.sort_values('timestamp', kind='stable')
+    X = data[FEATURE_COLUMNS].to_numpy(dtype=float)
+    y = data['label'].to_numpy(dtype=int)
+    return X, y
+
+def build_fold_cache(X, y, n_splits, cache_dir):
+    """Scale each time-series fold once and store it as memory-mappable arrays
+
+    The cache is keyed on a hash of the data and the split count, so
+    repeated runs on the same history skip this step. Returns the list
+    of fold file paths.
+    """
+    key = joblib.hash((X, y, n_splits))
+    fold_dir = os.path.join(cache_dir, key)
+    splits = list(TimeSeriesSplit(n_splits=n_splits).split(X))
+    paths = [os.path.join(fold_dir, f"fold_{i}.joblib") for i in range(len(splits))]
+    if all(os.path.exists(p) for p in paths):
+        logger.info(f"Using cached folds in {fold_dir}")
+        return paths
+
+    os.makedirs(fold_dir, exist_ok=True)
+    for path, (train_idx, test_idx) in zip(paths, splits):
+        scaler = StandardScaler().fit(X[train_idx])
+        joblib.dump({
+            'X_train': scaler.transform(X[train_idx]),
+            'y_train': y[train_idx],
+            'X_test': scaler.transform(X[test_idx]),
+            'y_test': y[test_idx]
+        }, path)
+    return paths
+
+def fold_predictions(family, params, fold_paths):
+    """Fit one configuration on every fold; yields (held-out labels, predicted probabilities)"""
+    estimator, _ = MODEL_GRID[family]
+    for path in fold_paths:
+        fold = joblib.load(path, mmap_mode='r')
+        if len(np.unique(fold['y_train'])) < 2:
+            continue
+        model = clone(estimator).set_params(**params)
+        model.fit(fold['X_train'], fold['y_train'])
+        yield np.asarray(fold['y_test']), model.predict_proba(fold['X_test'])[:, 1]
+
+def evaluate_candidate(family, params, fold_paths):
+    """Fit one configuration on every fold and return its mean scores"""
+    losses, accuracies = [], []
+    for y_test, proba in fold_predictions(family, params, fold_paths):
+        losses.append(log_loss(y_test, proba, labels=[0, 1]))
+        accuracies.append(accuracy_score(y_test, proba >= 0.5))
+    return {
+        'family': family,
+        'params': params,
+        'log_loss': float(np.mean(losses)) if losses else np.inf,
+        'accuracy': float(np.mean(accuracies)) if accuracies else 0.0
+    }
+
+def run_pipeline(X, y, output_path, n_splits=None, n_jobs=None, cache_dir=None, families=None):
+    """Cross-validate every candidate in parallel and export the best model
+
+    Candidates are ranked by mean out-of-fold log loss (probabilities feed
+    the confidence threshold, so calibration matters more than accuracy).
+    The winner is refit on all rows and saved, with a Platt calibration
+    fitted on its out-of-fold predictions, in the format
+    TradingModel.load_model reads. Returns the ranked results.
+    """
+    n_splits = n_splits or Config.TRAINING_CV_SPLITS
+    n_jobs = n_jobs if n_jobs is not None else Config.TRAINING_N_JOBS
+    cache_dir = cache_dir or Config.TRAINING_CACHE_DIR
+    families = families or list(MODEL_GRID)
+
+    started = time.perf_counter()
+    fold_paths = build_fold_cache(X, y, n_splits, cache_dir)
+    candidates = [(family, params) for family in families for params in ParameterGrid(MODEL_GRID[family][1])]
+    logger.info(f"Evaluating {len(candidates)} candidates on {len(fold_paths)} folds ({len(X)} rows)")
+
+    results = Parallel(n_jobs=n_jobs)(
+        delayed(evaluate_candidate)(family, params, fold_paths) for family, params in candidates
+    )
+    results.sort(key=lambda r: r['log_loss'])
+    best = results[0]
+    logger.info(f"Best model: {best['family']} {best['params']} "
+                f"(log loss {best['log_loss']:.4f}, accuracy {best['accuracy']:.2%})")
+
+    # Refit the winner on all data; keep column names on the scaler for TradingModel.predict
+    scaler = StandardScaler().fit(pd.DataFrame(X, columns=FEATURE_COLUMNS))
+    estimator = MODEL_GRID[best['family']][0]
+    model = clone(estimator).set_params(**best['params'])
+    if best['family'] == 'random_forest':
+        model.set_params(n_jobs=n_jobs)
+    model.fit(scaler.transform(pd.DataFrame(X, columns=FEATURE_COLUMNS)), y)
+    if best['family'] == 'random_forest':
+        # The bot scores one row per tick, where a thread pool only adds overhead
+        model.set_params(n_jobs=1)
+
+    # Calibrate on the winner's out-of-fold predictions, which the refit model has not seen
+    folds = list(fold_predictions(best['family'], best['params'], fold_paths))
+    calibrator = PlattCalibrator()
+    if folds:
+        calibrator.fit(np.concatenate([proba for _, proba in folds]), np.concatenate([y for y, _ in folds]))
+
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    joblib.dump({
+        'model': model,
+        'scaler': scaler,
+        'is_trained': True,
+        'training_samples': len(X),
+        'calibrator': calibrator
+    }, output_path)
+    logger.info(f"Exported model to {output_path} in {time.perf_counter() - started:.1f}s")
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tune and export a TradingModel from recorded features")
+    parser.add_argument('data', help="CSV/Parquet with feature columns and a 'label' column")
+    parser.add_argument('--output', default='data/models/trading_model.pkl')
+    parser.add_argument('--splits', type=int, default=None, help="Time-series CV folds")
+    parser.add_argument('--n-jobs', type=int, default=None, help="Worker processes (-1 for all cores)")
+    parser.add_argument('--cache-dir', default=None)
+    parser.add_argument('--families', nargs='+', choices=list(MODEL_GRID), default=None)
+    args = parser.parse_args(argv)
+
+    X, y = load_training_data(args.data)
+    results = run_pipeline(X, y, args.output, args.splits, args.n_jobs, args.cache_dir, args.families)
+    for r in results[:10]:
+        print(f"{r['log_loss']:.4f}  {r['accuracy']:.2%}  {r['family']}  {r['params']}")
+    return 0
+
+if __name__ == "__main__":
+    from src.logging_setup import setup_logging
+    setup_logging()
+    sys.exit(main())
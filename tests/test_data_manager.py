@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from config.settings import Config
+from src.data_manager import FEATURE_COLUMNS, DataManager
+
+MONDAY = datetime(2026, 1, 5, 10, 0)
+
+
+def feed(manager, n, asset="EURUSD"):
+    features = None
+    for i in range(n):
+        features = manager.add_tick({
+            'asset': asset, 'price': 1.1 + 0.0001 * (i % 7), 'volume': 100 + i,
+            'timestamp': MONDAY + timedelta(seconds=i)
+        })
+    return features
+
+
+def test_ticks_do_not_accumulate_feature_rows():
+    manager = DataManager()
+    feed(manager, 500)
+    assert not hasattr(manager, 'features')
+    assert len(manager.ticks["EURUSD"]) == min(500, Config.TICK_HISTORY)
+
+
+def test_recorded_samples_pair_features_with_labels(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'TRAINING_DATA_BATCH_SIZE', 3)
+    path = tmp_path / 'training.csv'
+    monkeypatch.setattr(Config, 'TRAINING_DATA_PATH', str(path))
+    manager = DataManager()
+
+    features = feed(manager, 25)
+    for label in [1, 0, 1, 1]:
+        manager.record_sample(features, label)
+    assert len(manager.pending_samples) == 1
+    assert manager.flush_samples() == 1
+
+    samples = pd.read_csv(path)
+    assert list(samples.columns) == ['timestamp', *FEATURE_COLUMNS, 'label']
+    assert samples['label'].tolist() == [1, 0, 1, 1]
+    assert np.allclose(samples['velocity'], features['velocity'].iloc[0])
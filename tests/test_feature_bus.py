@@ -0,0 +1,74 @@
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from src.data_manager import FEATURE_COLUMNS
+from src.feature_bus import FeatureBus
+from src.latency_tracer import LatencyTracer
+
+ASSETS = ["EURUSD", "GBPUSD"]
+
+
+@pytest.fixture
+def buses():
+    name = f"otc_test_bus_{os.getpid()}"
+    producer = FeatureBus(name=name, assets=ASSETS, capacity=4, create=True)
+    consumer = FeatureBus(name=name, assets=ASSETS, capacity=4)
+    yield producer, consumer
+    consumer.close()
+    producer.close()
+
+
+def tick(price, received_ns=None):
+    return {'asset': "EURUSD", 'price': price, 'volume': 10,
+            'timestamp': datetime(2026, 1, 5, 10, 0), 'received_ns': received_ns}
+
+
+def test_empty_slot_reads_none(buses):
+    _, consumer = buses
+    assert consumer.read_latest("EURUSD") is None
+
+
+def test_round_trip_with_features(buses):
+    producer, consumer = buses
+    features = np.arange(len(FEATURE_COLUMNS), dtype=float)
+    producer.publish("EURUSD", tick(1.1, received_ns=123456789012345), features)
+
+    seq, tick_data, read_features = consumer.read_latest("EURUSD")
+    assert seq == consumer.sequence("EURUSD")
+    assert tick_data['price'] == 1.1
+    assert tick_data['timestamp'] == datetime(2026, 1, 5, 10, 0)
+    assert tick_data['received_ns'] == 123456789012345
+    assert read_features.columns.tolist() == FEATURE_COLUMNS
+    np.testing.assert_array_equal(read_features.values[0], features)
+
+
+def test_features_missing_until_history(buses):
+    producer, consumer = buses
+    producer.publish("EURUSD", tick(1.1))
+    _, tick_data, features = consumer.read_latest("EURUSD")
+    assert features is None
+    assert tick_data['received_ns'] > 0
+
+
+def test_latest_tick_survives_ring_wraparound(buses):
+    producer, consumer = buses
+    for i in range(10):
+        producer.publish("EURUSD", tick(1.0 + i, received_ns=1000 + i))
+    _, tick_data, _ = consumer.read_latest("EURUSD")
+    assert tick_data['price'] == 10.0
+    assert tick_data['received_ns'] == 1009
+
+
+def test_staleness_includes_time_on_the_bus(buses):
+    producer, consumer = buses
+    producer.publish("EURUSD", tick(1.1, received_ns=time.monotonic_ns()))
+    time.sleep(0.05)
+
+    _, tick_data, _ = consumer.read_latest("EURUSD")
+    trace = LatencyTracer().start(tick_data)
+    trace.mark('order_submit')
+    assert trace.elapsed_ms('order_submit') >= 50
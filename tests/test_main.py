@@ -0,0 +1,80 @@
+import time as _time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from config.settings import Config
+from src.data_manager import FEATURE_COLUMNS
+from src.main import OTCTradingBot
+
+MONDAY = datetime(2026, 1, 5, 10, 0)
+
+
+class FlakyClient:
+    """Client whose orders raise (like a dropped connection) or are rejected"""
+    def __init__(self, error=None, result=None):
+        self.error = error
+        self.result = result or {'success': False, 'error': 'rejected'}
+        self.orders = 0
+
+    def place_trade(self, asset, amount, direction, expiry, trace_id=None):
+        self.orders += 1
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+@pytest.fixture
+def make_bot(monkeypatch):
+    def make(client):
+        bot = OTCTradingBot(client=client, use_journal=False, record_training_data=False)
+        bot.telegram_bot.enabled = False
+        bot.clock.update(MONDAY)
+        monkeypatch.setattr(bot.model, 'predict', lambda features: 0.9)
+        return bot
+    return make
+
+
+def tick(asset="EURUSD"):
+    return {'asset': asset, 'price': 1.1, 'timestamp': MONDAY, 'received_ns': _time.monotonic_ns()}
+
+
+def features():
+    return pd.DataFrame([np.zeros(len(FEATURE_COLUMNS))], columns=FEATURE_COLUMNS)
+
+
+def test_order_exception_releases_position(make_bot, monkeypatch):
+    monkeypatch.setattr(Config, "MAX_OPEN_POSITIONS_PER_ASSET", 1)
+    client = FlakyClient(error=ConnectionError("connection reset"))
+    bot = make_bot(client)
+
+    for _ in range(Config.MAX_OPEN_POSITIONS + 1):
+        with pytest.raises(ConnectionError):
+            bot.process_market_data(tick(), features())
+
+    # Every failed order was attempted and none left exposure behind
+    assert client.orders == Config.MAX_OPEN_POSITIONS + 1
+    assert bot.risk_manager.total_open_positions == 0
+    assert bot.risk_manager.can_trade(0.9, "EURUSD")
+
+
+def test_rejected_order_releases_position(make_bot):
+    bot = make_bot(FlakyClient())
+    bot.process_market_data(tick(), features())
+    assert bot.risk_manager.total_open_positions == 0
+    assert bot.trade_count == 0
+
+
+def test_settled_trade_is_recorded_once(make_bot):
+    client = FlakyClient(result={'success': True, 'outcome': 'win', 'payout': 0.092})
+    bot = make_bot(client)
+    bot.process_market_data(tick(), features())
+
+    assert bot.trade_count == 1
+    assert bot.risk_manager.total_open_positions == 0
+    trade = bot.risk_manager.trades[-1]
+    assert trade['asset'] == "EURUSD"
+    assert trade['tick_price'] == 1.1
+    assert trade['staleness_ms'] is not None
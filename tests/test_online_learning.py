@@ -0,0 +1,175 @@
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import SGDClassifier
+from sklearn.naive_bayes import GaussianNB
+from sklearn.preprocessing import StandardScaler
+
+from config.settings import Config
+from src.data_manager import FEATURE_COLUMNS
+from src.online_learning import IncrementalGaussianNB, OnlineEnsemble, PageHinkley
+from src.trading_model import TradingModel
+
+
+def session_rows(rng, n, day_of_week=0):
+    """Feature rows from one trading day: the calendar columns barely move"""
+    X = rng.normal(size=(n, len(FEATURE_COLUMNS)))
+    X[:, FEATURE_COLUMNS.index('hour_of_day')] = 10
+    X[:, FEATURE_COLUMNS.index('minute_of_hour')] = rng.integers(0, 60, n)
+    X[:, FEATURE_COLUMNS.index('day_of_week')] = day_of_week
+    return X
+
+
+def frame(X):
+    return pd.DataFrame(np.atleast_2d(X), columns=FEATURE_COLUMNS)
+
+
+class NaNMember:
+    classes_ = np.array([0, 1])
+
+    def predict_proba(self, X):
+        return np.full((len(X), 2), np.nan)
+
+    def predict(self, X):
+        return np.zeros(len(X), dtype=int)
+
+
+def test_incremental_nb_matches_batch_statistics():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 3))
+    y = (X[:, 0] > 0).astype(int)
+
+    online = IncrementalGaussianNB(var_floor=1e-9)
+    for i in range(len(X)):
+        online.partial_fit(X[i:i + 1], y[i:i + 1], classes=[0, 1])
+    batch = GaussianNB().fit(X, y)
+
+    np.testing.assert_allclose(online.theta_, batch.theta_)
+    np.testing.assert_allclose(online.var_, batch.var_, rtol=1e-6)
+    # Only the Laplace-smoothed class prior differs
+    np.testing.assert_allclose(online.predict_proba(X), batch.predict_proba(X), atol=1e-2)
+
+
+def test_incremental_nb_survives_constant_feature():
+    rng = np.random.default_rng(1)
+    nb = IncrementalGaussianNB()
+    for _ in range(50):
+        x = np.array([[rng.normal(), 3.0]])
+        nb.partial_fit(x, [int(x[0, 0] > 0)], classes=[0, 1])
+
+    proba = nb.predict_proba(np.array([[0.5, 4.0], [-0.5, 2.0]]))
+    assert np.isfinite(proba).all()
+    assert proba[0, 1] > 0.5 > proba[1, 1]
+
+
+def test_incremental_nb_column_subset():
+    nb = IncrementalGaussianNB(columns=[0])
+    nb.partial_fit(np.array([[1.0, 100.0], [-1.0, -100.0]]), [1, 0], classes=[0, 1])
+    assert nb.theta_.shape == (2, 1)
+    assert nb.predict(np.array([[1.0, -100.0]]))[0] == 1
+
+
+def test_fresh_model_single_row_updates_stay_finite():
+    rng = np.random.default_rng(2)
+    X = session_rows(rng, 200)
+    y = (X[:, 0] > 0).astype(int)
+    model = TradingModel()
+
+    predictions = []
+    for i in range(len(X)):
+        predictions.append(model.predict(frame(X[i])))
+        model.update(frame(X[i]), y[i])
+
+    predictions = np.array(predictions)
+    assert np.isfinite(predictions).all()
+    assert ((predictions[100:] >= 0.5) == y[100:]).mean() > 0.7
+
+
+def test_broken_member_abstains():
+    ensemble = OnlineEnsemble(members=[SGDClassifier(loss='log_loss', random_state=0)])
+    ensemble.partial_fit(np.array([[1.0], [-1.0]]), [1, 0])
+    ensemble.members.append(NaNMember())
+    ensemble.accuracy = np.array([0.5, 0.5])
+
+    proba = ensemble.predict_proba(np.array([[5.0]]))
+    assert np.isfinite(proba).all()
+    assert 0.5 < proba[0, 1] < 1.0
+
+
+def test_page_hinkley_flags_rise_in_error_rate():
+    detector = PageHinkley(delta=0.05, threshold=5, min_instances=10)
+    assert not any(detector.update(0.0) for _ in range(100))
+    assert any(detector.update(1.0) for _ in range(20))
+
+
+def test_drift_resets_members_on_recent_window(monkeypatch):
+    monkeypatch.setattr(Config, 'DRIFT_RETRAIN_WINDOW', 20)
+    rng = np.random.default_rng(3)
+    ensemble = OnlineEnsemble(
+        members=[SGDClassifier(loss='log_loss', random_state=0), IncrementalGaussianNB()],
+        seed=SGDClassifier(loss='log_loss').fit([[1.0, 0.0], [-1.0, 0.0]], [1, 0])
+    )
+    ensemble.drift_detector = PageHinkley(delta=0.05, threshold=5, min_instances=10)
+
+    drifted = False
+    for i in range(200):
+        x = rng.normal(size=2)
+        # The seed's concept (label = sign of x0) flips after 100 trades
+        label = int(x[0] > 0) if i < 100 else int(x[0] <= 0)
+        error = 0.0 if i < 100 else 1.0
+        if ensemble.learn_one(x, label, outcome_error=error):
+            drifted = True
+            break
+
+    assert drifted
+    assert ensemble.drift_count == 1
+    assert ensemble.seed is None
+    assert ensemble.samples_seen == 20
+    assert ensemble.fitted
+
+
+@pytest.fixture
+def exported_model(tmp_path):
+    rng = np.random.default_rng(4)
+    X = frame(np.vstack([session_rows(rng, 200, day) for day in range(5)]))
+    y = (X['velocity'] > 0).astype(int)
+    scaler = StandardScaler().fit(X)
+    path = tmp_path / 'model.pkl'
+    joblib.dump({
+        'model': SGDClassifier(loss='log_loss', random_state=0).fit(scaler.transform(X), y),
+        'scaler': scaler,
+        'is_trained': True,
+        'training_samples': len(X)
+    }, path)
+    return path
+
+
+def test_loading_bare_model_seeds_ensemble(exported_model, tmp_path):
+    model = TradingModel()
+    assert model.load_model(exported_model)
+    assert isinstance(model.model, OnlineEnsemble)
+    assert isinstance(model.model.seed, SGDClassifier)
+
+    # Only the seed votes until the members have warmed up
+    voters, _ = model.model._voters()
+    assert voters == [model.model.seed]
+
+    rng = np.random.default_rng(5)
+    X = session_rows(rng, Config.WARMUP_PERIOD, day_of_week=0)
+    for x in X:
+        model.update(frame(x), int(x[0] > 0))
+    assert len(model.model._voters()[0]) == 3
+
+    # A new weekday must not saturate the members that only saw one day
+    X_next = session_rows(rng, 200, day_of_week=1)
+    predictions = np.array([model.predict(frame(x)) for x in X_next])
+    assert np.isfinite(predictions).all()
+    assert ((predictions >= 0.5) == (X_next[:, 0] > 0)).mean() > 0.8
+
+    path = tmp_path / 'resaved.pkl'
+    model.save_model(path)
+    reloaded = TradingModel()
+    reloaded.load_model(path)
+    assert reloaded.model.seed is not None
+    assert reloaded.model.samples_seen == Config.WARMUP_PERIOD
@@ -0,0 +1,35 @@
+import json
+from urllib.request import urlopen
+
+import pytest
+
+from src.performance_analytics import PerformanceAnalytics, StatsServer
+
+
+@pytest.fixture
+def servers():
+    started = []
+    yield started
+    for server in started:
+        server.stop()
+
+
+def test_instances_on_port_zero_bind_their_own_ports(servers):
+    for _ in range(2):
+        server = StatsServer(PerformanceAnalytics(), host='127.0.0.1', port=0)
+        assert server.start()
+        servers.append(server)
+
+    ports = [server.port for server in servers]
+    assert 0 not in ports
+    assert ports[0] != ports[1]
+
+    with urlopen(f"http://127.0.0.1:{ports[1]}/stats", timeout=5) as response:
+        assert json.load(response)['total_trades'] == 0
+
+
+def test_port_in_use_fails_without_raising(servers):
+    first = StatsServer(PerformanceAnalytics(), host='127.0.0.1', port=0)
+    assert first.start()
+    servers.append(first)
+    assert not StatsServer(PerformanceAnalytics(), host='127.0.0.1', port=first.port).start()
@@ -0,0 +1,172 @@
+import logging
+from datetime import datetime, time, timedelta
+
+import numpy as np
+import pytest
+
+from config.settings import Config
+from src.market_clock import MarketClock
+from src.risk_manager import RiskManager
+
+MONDAY = datetime(2026, 1, 5, 10, 0)
+TUESDAY = datetime(2026, 1, 6, 10, 0)
+
+
+@pytest.fixture
+def clock():
+    clock = MarketClock(
+        trading_hours={"start": time(8, 0), "end": time(20, 0), "weekdays": range(5)},
+        sessions={"BTCUSD": {"start": time(0, 0), "end": time(23, 59), "weekdays": range(7)}},
+        holidays=[]
+    )
+    clock.update(MONDAY)
+    return clock
+
+
+@pytest.fixture
+def risk(clock):
+    return RiskManager(clock=clock)
+
+
+def record(risk, outcome, asset="EURUSD", amount=0.1):
+    risk.open_position(asset)
+    profit = amount * 0.92 if outcome == "win" else -amount
+    return risk.record_trade(amount, outcome, profit, asset=asset, confidence=0.7)
+
+
+def test_allows_confident_trade_in_session(risk):
+    assert risk.can_trade(0.7, "EURUSD")
+    assert not risk.can_trade(Config.CONFIDENCE_THRESHOLD - 0.01, "EURUSD")
+
+
+def test_session_follows_clock_not_wall_time(risk, clock):
+    clock.update(datetime(2026, 1, 5, 21, 0))
+    assert not risk.can_trade(0.7, "EURUSD")
+    assert risk.can_trade(0.7, "BTCUSD")
+
+    clock.update(datetime(2026, 1, 10, 10, 0))  # Saturday
+    assert not risk.can_trade(0.7, "EURUSD")
+    assert risk.can_trade(0.7, "BTCUSD")
+
+
+def test_daily_loss_limit_blocks_and_warns_once(risk, clock, caplog, monkeypatch):
+    monkeypatch.setattr(Config, "STOP_LOSS_STREAK", 100)
+    risk.can_trade(0.7, "EURUSD")
+
+    with caplog.at_level(logging.WARNING, logger="src.risk_manager"):
+        for _ in range(8):
+            record(risk, "loss")
+        for second in range(0, 60, 5):
+            clock.update(MONDAY.replace(minute=30, second=second))
+            assert not risk.can_trade(0.9, "EURUSD")
+
+    warnings = [r for r in caplog.records if r.levelno == logging.WARNING]
+    assert len(warnings) == 1
+    assert "Daily loss limit" in warnings[0].getMessage()
+
+
+def test_new_day_resets_counters_and_clears_gate(risk, clock, caplog):
+    risk.can_trade(0.7, "EURUSD")
+    for _ in range(Config.STOP_LOSS_STREAK):
+        record(risk, "loss")
+    assert risk.blocked_reason is not None
+    assert not risk.can_trade(0.9, "EURUSD")
+
+    clock.update(MONDAY.replace(hour=19, minute=59))
+    assert not risk.can_trade(0.9, "EURUSD")
+
+    with caplog.at_level(logging.INFO, logger="src.risk_manager"):
+        clock.update(TUESDAY)
+        assert risk.can_trade(0.9, "EURUSD")
+
+    assert risk.blocked_reason is None
+    assert risk.daily_trades == 0
+    assert risk.daily_profit == 0
+    assert risk.consecutive_losses == 0
+    assert risk.trading_date == TUESDAY.date()
+    assert any("Trading allowed" in r.getMessage() for r in caplog.records)
+
+
+def test_drawdown_survives_day_rollover(risk, clock, monkeypatch):
+    monkeypatch.setattr(Config, "MAX_DAILY_LOSS", 100)
+    monkeypatch.setattr(Config, "STOP_LOSS_STREAK", 100)
+    risk.can_trade(0.7, "EURUSD")
+    record(risk, "loss", amount=Config.MAX_DRAWDOWN)
+    assert "drawdown" in risk.blocked_reason
+
+    clock.update(TUESDAY)
+    assert not risk.can_trade(0.9, "EURUSD")
+    assert "drawdown" in risk.blocked_reason
+
+
+def test_win_clears_losing_streak(risk, monkeypatch):
+    monkeypatch.setattr(Config, "MAX_DAILY_LOSS", 100)
+    risk.can_trade(0.7, "EURUSD")
+    for _ in range(Config.STOP_LOSS_STREAK):
+        record(risk, "loss")
+    assert "consecutive losses" in risk.blocked_reason
+
+    record(risk, "win")
+    assert risk.blocked_reason is None
+    assert risk.can_trade(0.9, "EURUSD")
+
+
+def test_per_asset_exposure_limit(risk, monkeypatch):
+    monkeypatch.setattr(Config, "MAX_OPEN_POSITIONS_PER_ASSET", 1)
+    risk.open_position("EURUSD")
+    assert not risk.can_trade(0.9, "EURUSD")
+    assert risk.can_trade(0.9, "GBPUSD")
+
+    risk.close_position("EURUSD")
+    assert risk.can_trade(0.9, "EURUSD")
+
+
+def test_record_trade_releases_position(risk):
+    record(risk, "win")
+    assert risk.total_open_positions == 0
+    assert risk.open_positions["EURUSD"] == 0
+
+
+def test_batch_keeps_most_confident_within_limits(risk, monkeypatch):
+    monkeypatch.setattr(Config, "MAX_OPEN_POSITIONS", 3)
+    monkeypatch.setattr(Config, "MAX_OPEN_POSITIONS_PER_ASSET", 1)
+    risk.open_position("USDJPY")
+
+    assets = ["EURUSD", "EURUSD", "GBPUSD", "USDJPY", "BTCUSD", "ETHUSD"]
+    confidences = [0.70, 0.90, 0.80, 0.95, 0.60, 0.75]
+    allowed = risk.can_trade_batch(confidences, assets)
+
+    # One EURUSD slot (the 0.90), USDJPY already open, BTCUSD below threshold,
+    # and only two of the three total slots are free
+    assert allowed.tolist() == [False, True, True, False, False, False]
+
+
+def test_batch_respects_sessions_and_gate(risk, clock):
+    assets = ["EURUSD", "BTCUSD"]
+    clock.update(datetime(2026, 1, 10, 10, 0))  # Saturday: only BTCUSD trades
+    assert risk.can_trade_batch([0.9, 0.9], assets).tolist() == [False, True]
+
+    for _ in range(Config.STOP_LOSS_STREAK):
+        record(risk, "loss", asset="BTCUSD")
+    assert not risk.can_trade_batch([0.9, 0.9], assets).any()
+
+
+def test_batch_matches_single_checks(risk, clock):
+    rng = np.random.default_rng(0)
+    assets = list(Config.ASSETS)
+    for minute in range(0, 24 * 60, 97):
+        clock.update(MONDAY.replace(hour=0) + timedelta(minutes=minute))
+        confidences = rng.uniform(0.5, 1.0, len(assets))
+        allowed = risk.can_trade_batch(confidences, assets)
+        single = [risk.can_trade(c, a) for c, a in zip(confidences, assets)]
+        assert allowed.tolist() == single
+
+
+def test_empty_batch(risk):
+    assert risk.can_trade_batch([], []).tolist() == []
+
+
+def test_nan_confidence_is_rejected(risk):
+    assert not risk.can_trade(float('nan'), "EURUSD")
+    allowed = risk.can_trade_batch([np.nan, 0.9], ["EURUSD", "GBPUSD"])
+    assert allowed.tolist() == [False, True]
@@ -0,0 +1,145 @@
+from datetime import datetime, time, timedelta
+
+import pytest
+
+from src.scheduler import Scheduler
+
+MONDAY = datetime(2026, 1, 5, 9, 59)
+
+
+class FakeClock:
+    """Monotonic seconds plus a wall clock that can be stepped on its own (NTP/DST)"""
+    def __init__(self, start=MONDAY):
+        self.seconds = 1000.0
+        self.start = start
+        self.wall_offset = timedelta(0)
+
+    def monotonic(self):
+        return self.seconds
+
+    def wall_clock(self):
+        return self.start + timedelta(seconds=self.seconds - 1000.0) + self.wall_offset
+
+    def advance(self, seconds):
+        self.seconds += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def make_scheduler(clock):
+    def make(**kwargs):
+        return Scheduler(monotonic=clock.monotonic, wall_clock=clock.wall_clock, **kwargs)
+    return make
+
+
+def test_interval_job_skips_missed_runs(clock, make_scheduler):
+    scheduler = make_scheduler()
+    calls = []
+    job = scheduler.every(10, lambda: calls.append(clock.seconds), name="tick")
+
+    assert scheduler.run_pending() == 10
+    assert calls == [1000.0]
+
+    # Stalled for 35s: one catch-up run, then back on the 10s grid
+    clock.advance(35)
+    assert scheduler.run_pending() == pytest.approx(5)
+    assert calls == [1000.0, 1035.0]
+    assert job.due == 1040.0
+
+    clock.advance(5)
+    scheduler.run_pending()
+    assert len(calls) == 3 and job.runs == 3
+
+
+def test_slow_interval_job_keeps_its_cadence(clock, make_scheduler):
+    scheduler = make_scheduler()
+    job = scheduler.every(10, lambda: clock.advance(25), name="slow")
+
+    scheduler.run_pending()
+    assert clock.seconds == 1025.0
+    assert job.due == 1030.0
+
+
+def test_job_can_override_its_next_delay(clock, make_scheduler):
+    scheduler = make_scheduler()
+    job = scheduler.every(10, lambda: 300, name="sleepy")
+    assert scheduler.run_pending() == 300
+    assert job.due == 1300.0
+
+
+def test_daily_job_fires_once_per_day(clock, make_scheduler):
+    scheduler = make_scheduler()
+    calls = []
+
+    def report():
+        calls.append(clock.wall_clock())
+        # NTP steps the wall clock back five minutes while the report runs
+        clock.wall_offset = -timedelta(minutes=5)
+
+    scheduler.daily(time(10, 0), report, name="report")
+    assert scheduler.run_pending() == pytest.approx(60)
+    clock.advance(60)
+    assert scheduler.run_pending() > 23 * 3600
+    assert calls == [datetime(2026, 1, 5, 10, 0)]
+
+    clock.advance(600)
+    scheduler.run_pending()
+    assert len(calls) == 1
+
+    clock.advance(24 * 3600)
+    scheduler.run_pending()
+    assert len(calls) == 2
+
+
+def test_daily_job_woken_early_does_not_refire(clock, make_scheduler):
+    scheduler = make_scheduler()
+    calls = []
+    job = scheduler.daily(time(10, 0), lambda: calls.append(clock.wall_clock()), name="report")
+    # The wall clock drifts behind the monotonic clock, so the job runs at 09:59:59.5
+    clock.wall_offset = -timedelta(seconds=0.5)
+
+    clock.advance(job.due - clock.seconds)
+    scheduler.run_pending()
+    clock.advance(1)
+    scheduler.run_pending()
+
+    assert len(calls) == 1
+    assert job.last_target == datetime(2026, 1, 6, 10, 0)
+
+
+def test_failing_interval_job_backs_off(clock, make_scheduler):
+    errors = []
+    scheduler = make_scheduler(on_error=lambda job, e: errors.append((job.name, str(e))), error_delay=30)
+
+    def flaky():
+        raise RuntimeError("feed down")
+
+    job = scheduler.every(10, flaky, name="poll")
+    assert scheduler.run_pending() == 30
+    assert errors == [("poll", "feed down")]
+    assert job.runs == 0
+
+    # Not retried at the normal 10s rate
+    clock.advance(10)
+    scheduler.run_pending()
+    assert len(errors) == 1
+    clock.advance(20)
+    scheduler.run_pending()
+    assert len(errors) == 2
+
+
+def test_failing_daily_job_waits_for_next_day(clock, make_scheduler):
+    errors = []
+    scheduler = make_scheduler(on_error=lambda job, e: errors.append(job.name), error_delay=30)
+
+    def report():
+        raise ValueError("no data")
+
+    scheduler.daily(time(10, 0), report, name="report")
+    clock.advance(60)
+    assert scheduler.run_pending() == pytest.approx(24 * 3600)
+    assert errors == ["report"]
@@ -0,0 +1,16 @@
+from config.settings import Config
+from src.soak import run_soak
+
+
+def test_short_soak_keeps_memory_flat_and_spills(monkeypatch):
+    monkeypatch.setattr(Config, 'TRADE_SPILL_BATCH_SIZE', 5)
+    spill_path, max_trades = Config.TRADE_SPILL_PATH, Config.MAX_TRADES_IN_MEMORY
+
+    passed, growth, monitor, spilled = run_soak(days=0.25, max_trades_in_memory=10)
+
+    assert passed, f"RSS grew {growth:.1f} MB"
+    assert spilled > 0
+    assert len(monitor.samples) > 1
+    # The soak's temporary overrides are undone
+    assert Config.TRADE_SPILL_PATH == spill_path
+    assert Config.MAX_TRADES_IN_MEMORY == max_trades
@@ -0,0 +1,144 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from config.settings import Config
+from src.market_clock import MarketClock
+from src.risk_manager import RiskManager
+from src.trade_journal import ADDED_COLUMNS, TradeJournal
+
+START = datetime(2026, 1, 5, 9, 0)
+
+
+@pytest.fixture
+def journal_path(tmp_path):
+    return str(tmp_path / 'journal.db')
+
+
+def trade_stream(n, seed=0, spacing=timedelta(minutes=7)):
+    """Deterministic trades spread over several days"""
+    rng = np.random.default_rng(seed)
+    assets = list(Config.ASSETS)
+    for i in range(n):
+        win = rng.random() < 0.55
+        yield (START + i * spacing, assets[i % len(assets)], 'win' if win else 'loss',
+               float(rng.uniform(0.6, 0.95)))
+
+
+def run_live(journal, trades, amount=0.1):
+    """Feed trades through a RiskManager the way the bot does; returns it"""
+    clock = MarketClock()
+    risk = RiskManager(clock=clock, journal=journal)
+    for timestamp, asset, outcome, confidence in trades:
+        clock.update(timestamp)
+        risk.can_trade(confidence, asset)  # Applies the day rollover like the bot
+        risk.open_position(asset)
+        profit = amount * 0.92 if outcome == 'win' else -amount
+        risk.record_trade(amount, outcome, profit, asset=asset, confidence=confidence)
+    if journal is not None:
+        journal.close()
+    return risk
+
+
+def assert_stats_equal(restored, live):
+    for key, value in live.items():
+        if isinstance(value, dict):
+            assert restored[key].keys() == value.keys(), key
+            for bucket, counters in value.items():
+                assert restored[key][bucket] == pytest.approx(counters), (key, bucket)
+        else:
+            assert restored[key] == pytest.approx(value), key
+
+
+def test_restored_analytics_cover_the_whole_journal(journal_path, monkeypatch):
+    monkeypatch.setattr(Config, 'MAX_TRADES_IN_MEMORY', 100)
+    live = run_live(TradeJournal(journal_path, snapshot_every=250), trade_stream(1200))
+
+    restored = RiskManager(clock=MarketClock(), journal=TradeJournal(journal_path))
+
+    assert len(restored.trades) == 100
+    assert_stats_equal(restored.analytics.get_stats(), live.analytics.get_stats())
+    assert restored.get_performance_stats()['total_trades'] == 1200
+
+
+def live_state(risk):
+    return {'balance': risk.balance, 'daily_profit': risk.daily_profit, 'daily_trades': risk.daily_trades,
+            'consecutive_losses': risk.consecutive_losses, 'last_trade_time': risk.last_trade_time}
+
+
+def assert_state_equal(state, live):
+    assert state['last_trade_time'] == live['last_trade_time']
+    for key in ['balance', 'daily_profit', 'daily_trades', 'consecutive_losses']:
+        assert state[key] == pytest.approx(live[key]), key
+
+
+@pytest.mark.parametrize('snapshot_every', [37, 100, 10000])
+def test_snapshot_plus_replay_matches_live_state(journal_path, snapshot_every):
+    live = run_live(TradeJournal(journal_path, snapshot_every=snapshot_every), trade_stream(500))
+
+    state, _ = TradeJournal(journal_path).recover()
+    restored = RiskManager(clock=MarketClock(), journal=TradeJournal(journal_path))
+
+    assert_state_equal(state, live_state(live))
+    assert_state_equal(live_state(restored), live_state(live))
+
+
+def test_replay_resets_daily_counters_on_new_day(journal_path):
+    monday = [(START.replace(hour=18) + timedelta(minutes=i), 'EURUSD', 'loss', 0.7) for i in range(5)]
+    tuesday = [(START.replace(hour=9) + timedelta(days=1, minutes=i), 'EURUSD', outcome, 0.7)
+               for i, outcome in enumerate(['win', 'loss', 'loss'])]
+    # The snapshot lands on Monday's last trade, so Tuesday's trades are replayed
+    live = run_live(TradeJournal(journal_path, snapshot_every=5), monday + tuesday)
+
+    state, _ = TradeJournal(journal_path).recover()
+    assert state['daily_trades'] == 3
+    assert state['consecutive_losses'] == 2
+    assert state['daily_profit'] == pytest.approx(0.1 * 0.92 - 0.2)
+    assert_state_equal(state, live_state(live))
+
+
+def test_recover_reads_a_bounded_history(journal_path):
+    trades = list(trade_stream(1000))
+    run_live(TradeJournal(journal_path, snapshot_every=300), trades)
+    journal = TradeJournal(journal_path)
+
+    # Shorter than the replay after the last snapshot (trade 900)
+    state, recent = journal.recover(history=25)
+    assert [t['time'] for t in recent] == [t[0] for t in trades[-25:]]
+    assert state['daily_trades'] > 0
+
+    # Longer than the replay, so older trades are read as history only
+    _, recent = journal.recover(history=250)
+    assert [t['time'] for t in recent] == [t[0] for t in trades[-250:]]
+
+
+def test_old_schema_gains_new_columns(journal_path):
+    conn = sqlite3.connect(journal_path)
+    with conn:
+        conn.execute(
+            "CREATE TABLE trades (id INTEGER PRIMARY KEY, time TEXT, amount REAL, outcome TEXT, "
+            "profit REAL, balance REAL, daily_profit REAL, daily_trades INTEGER, consecutive_losses INTEGER)"
+        )
+        conn.execute("INSERT INTO trades VALUES (1, ?, 0.1, 'win', 0.092, 10.092, 0.092, 1, 0)",
+                     (START.isoformat(),))
+    conn.close()
+
+    journal = TradeJournal(journal_path)
+    conn = sqlite3.connect(journal_path)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(trades)")}
+    conn.close()
+    assert set(ADDED_COLUMNS) <= columns
+
+    journal.append({'time': START + timedelta(minutes=1), 'amount': 0.1, 'outcome': 'loss', 'profit': -0.1,
+                    'balance': 9.992, 'daily_profit': -0.008, 'daily_trades': 2, 'consecutive_losses': 1,
+                    'asset': 'EURUSD', 'confidence': 0.7, 'trace_id': 42, 'tick_price': 1.1,
+                    'staleness_ms': 3.5})
+    journal.close()
+
+    state, (old, new) = journal.recover()
+    assert old['asset'] is None and old['trace_id'] is None
+    assert (new['asset'], new['trace_id'], new['tick_price'], new['staleness_ms']) == ('EURUSD', 42, 1.1, 3.5)
+    assert state['balance'] == pytest.approx(10.092 - 0.1)
+    assert state['daily_trades'] == 2
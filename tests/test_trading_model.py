@@ -0,0 +1,140 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from config.settings import Config
+from src.calibration import PlattCalibrator
+from src.data_manager import FEATURE_COLUMNS
+from src.trading_model import TradingModel
+
+
+class FixedModel:
+    """Stands in for the ensemble: returns preset P(call wins) per row"""
+    def __init__(self, probabilities):
+        self.probabilities = np.asarray(probabilities, dtype=float)
+
+    def predict_proba(self, X):
+        p = self.probabilities[:len(X)]
+        return np.column_stack([1 - p, p])
+
+
+def frame(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(rng.normal(size=(n, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS)
+
+
+@pytest.fixture
+def trained_model():
+    X = frame(500)
+    model = TradingModel()
+    assert model.train(X, (X['velocity'] > 0).astype(int))
+    return model
+
+
+def fixed_model(probabilities):
+    model = TradingModel()
+    model.scaler.fit(frame(50))
+    model.model = FixedModel(probabilities)
+    model.is_trained = True
+    return model
+
+
+def test_unfitted_calibrator_is_identity():
+    p = np.array([0.1, 0.5, 0.9])
+    np.testing.assert_allclose(PlattCalibrator().transform(p), p)
+
+
+def test_calibrator_tames_overconfident_model():
+    rng = np.random.default_rng(1)
+    # Raw scores are near 0 or 1, but only 60% of them are right
+    labels = rng.integers(0, 2, 2000)
+    correct = rng.random(2000) < 0.6
+    predicted = np.where(correct, labels, 1 - labels)
+    raw = np.where(predicted == 1, 1 - 1e-12, 2.46e-41)
+
+    calibrator = PlattCalibrator()
+    assert calibrator.fit(raw, labels)
+    calibrated = calibrator.transform(raw)
+    assert calibrated[predicted == 1].mean() == pytest.approx(0.6, abs=0.03)
+    assert calibrated[predicted == 0].mean() == pytest.approx(0.4, abs=0.03)
+
+
+def test_calibrator_needs_both_classes():
+    calibrator = PlattCalibrator()
+    assert not calibrator.fit([0.7, 0.8], [1, 1])
+    assert not calibrator.fitted
+
+
+def test_predict_batch_ranks_both_directions():
+    model = fixed_model([0.55, 0.90, 0.12, 0.70, 0.32, 0.66])
+    assets = ["A", "B", "C", "D", "E", "F"]
+    probabilities, signals = model.predict_batch(frame(6), assets)
+
+    np.testing.assert_allclose(probabilities, [0.55, 0.90, 0.12, 0.70, 0.32, 0.66])
+    assert [s['asset'] for s in signals] == ["B", "C", "D", "E", "F"]
+    assert [s['direction'] for s in signals] == ["call", "put", "call", "put", "call"]
+    assert signals[1]['confidence'] == pytest.approx(0.88)
+    assert all(s['confidence'] >= Config.CONFIDENCE_THRESHOLD for s in signals)
+
+
+def test_predict_batch_top_k_keeps_best():
+    model = fixed_model([0.55, 0.90, 0.12, 0.70, 0.32, 0.66])
+    _, signals = model.predict_batch(frame(6), list("ABCDEF"), top_k=2)
+    assert [s['asset'] for s in signals] == ["B", "C"]
+
+
+@pytest.mark.filterwarnings("ignore:X does not have valid feature names")
+def test_predict_batch_accepts_arrays_without_assets():
+    model = fixed_model([0.9, 0.2])
+    _, signals = model.predict_batch(frame(2).to_numpy())
+    assert [s['asset'] for s in signals] == [0, 1]
+
+
+def test_predict_batch_untrained_and_empty():
+    model = TradingModel()
+    probabilities, signals = model.predict_batch(frame(3))
+    assert probabilities.tolist() == [0.5, 0.5, 0.5]
+    assert signals == []
+    assert model.predict_batch(frame(0))[0].size == 0
+
+
+def test_predict_batch_matches_predict(trained_model):
+    X = frame(20, seed=2)
+    probabilities, _ = trained_model.predict_batch(X)
+    single = [trained_model.predict(X.iloc[[i]]) for i in range(len(X))]
+    np.testing.assert_allclose(probabilities, single)
+
+
+def test_predict_batch_cost_is_flat(trained_model):
+    X = frame(500, seed=3)
+
+    def fastest(call, repeats=20):
+        times = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            call()
+            times.append(time.perf_counter() - started)
+        return min(times)
+
+    one = fastest(lambda: trained_model.predict_batch(X.iloc[:1]))
+    many = fastest(lambda: trained_model.predict_batch(X))
+    # Scoring 500 assets costs about the same as scoring one
+    assert many < 5 * one
+
+
+def test_update_refits_calibration(monkeypatch):
+    monkeypatch.setattr(Config, 'CALIBRATION_MIN_SAMPLES', 100)
+    monkeypatch.setattr(Config, 'CALIBRATION_REFIT_EVERY', 50)
+    X = frame(300, seed=4)
+    labels = (X['velocity'] > 0).astype(int)
+    model = TradingModel()
+    model.train(X.iloc[:100], labels.iloc[:100])
+
+    for i in range(100, 300):
+        model.update(X.iloc[[i]], labels.iloc[i])
+
+    assert model.calibrator.fitted
+    assert model.calibrator.samples == 200
+    assert 0 <= model.predict(X.iloc[[0]]) <= 1
@@ -0,0 +1,81 @@
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import SGDClassifier
+
+from src import training_pipeline
+from src.calibration import PlattCalibrator
+from src.data_manager import FEATURE_COLUMNS
+from src.online_learning import OnlineEnsemble
+from src.trading_model import TradingModel
+
+
+@pytest.fixture
+def synthetic_data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(400, len(FEATURE_COLUMNS)))
+    y = (X[:, 0] + 0.5 * rng.normal(size=len(X)) > 0).astype(int)
+    return X, y
+
+
+@pytest.fixture
+def small_grid(monkeypatch):
+    monkeypatch.setitem(training_pipeline.MODEL_GRID, 'random_forest', (
+        RandomForestClassifier(random_state=42, n_jobs=1),
+        {'n_estimators': [20], 'max_depth': [4]}
+    ))
+    monkeypatch.setitem(training_pipeline.MODEL_GRID, 'sgd', (
+        SGDClassifier(loss='log_loss', random_state=42),
+        {'alpha': [1e-3]}
+    ))
+
+
+def test_export_round_trips_into_trading_model(synthetic_data, small_grid, tmp_path):
+    X, y = synthetic_data
+    output = str(tmp_path / 'model.pkl')
+    results = training_pipeline.run_pipeline(
+        X, y, output, n_splits=3, n_jobs=2, cache_dir=str(tmp_path / 'cache'),
+        families=['random_forest', 'sgd']
+    )
+
+    assert [r['log_loss'] for r in results] == sorted(r['log_loss'] for r in results)
+    exported = joblib.load(output)
+    assert isinstance(exported['calibrator'], PlattCalibrator)
+    assert exported['calibrator'].fitted
+    if isinstance(exported['model'], RandomForestClassifier):
+        assert exported['model'].n_jobs == 1
+
+    model = TradingModel()
+    assert model.load_model(output)
+    assert isinstance(model.model, OnlineEnsemble)
+    assert type(model.model.seed) is type(exported['model'])
+
+    frame = pd.DataFrame(X[-50:], columns=FEATURE_COLUMNS)
+    predictions = np.array([model.predict(frame.iloc[[i]]) for i in range(len(frame))])
+    assert np.isfinite(predictions).all()
+    assert ((predictions >= 0.5) == y[-50:]).mean() > 0.7
+
+
+def test_forest_winner_is_exported_single_threaded(synthetic_data, small_grid, tmp_path):
+    X, y = synthetic_data
+    output = str(tmp_path / 'forest.pkl')
+    training_pipeline.run_pipeline(X, y, output, n_splits=3, n_jobs=2,
+                                   cache_dir=str(tmp_path / 'cache'), families=['random_forest'])
+
+    forest = joblib.load(output)['model']
+    assert isinstance(forest, RandomForestClassifier)
+    assert forest.n_jobs == 1
+
+
+def test_load_training_data_sorts_by_time(tmp_path):
+    rows = pd.DataFrame(np.arange(3 * len(FEATURE_COLUMNS)).reshape(3, -1), columns=FEATURE_COLUMNS)
+    rows.insert(0, 'timestamp', ['2026-01-05 10:02', '2026-01-05 10:00', '2026-01-05 10:01'])
+    rows['label'] = [0, 1, 0]
+    path = tmp_path / 'training.csv'
+    rows.to_csv(path, index=False)
+
+    X, y = training_pipeline.load_training_data(str(path))
+    assert y.tolist() == [1, 0, 0]
+    assert X[0, 0] == rows.loc[1, 'velocity']